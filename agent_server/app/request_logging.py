@@ -0,0 +1,64 @@
+import logging
+from contextvars import ContextVar
+
+from starlette.datastructures import QueryParams
+
+# Whether the current request asked for debug logs with ?verbose=true
+verbose_var: ContextVar[bool] = ContextVar("verbose", default=False)
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+class VerboseLogger(logging.LoggerAdapter):
+    """Logger whose debug calls return before building a record unless the current request is verbose"""
+
+    def isEnabledFor(self, level: int) -> bool:
+        return (level > logging.DEBUG or verbose_var.get()) and self.logger.isEnabledFor(level)
+
+
+def get_logger(name: str) -> VerboseLogger:
+    """Logger for a leash.* name, gated on verbose_var for debug records"""
+    return VerboseLogger(logging.getLogger(name), {})
+
+
+class VerboseFilter(logging.Filter):
+    """Drops debug records unless the current request is verbose"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or verbose_var.get()
+
+
+class VerboseMiddleware:
+    """ASGI middleware setting verbose_var from the request's verbose query parameter"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Skip parsing the query string for the common non-verbose request
+        if scope["type"] != "http" or b"verbose" not in scope["query_string"]:
+            await self.app(scope, receive, send)
+            return
+
+        verbose = QueryParams(scope["query_string"]).get("verbose", "").lower() in _TRUE_VALUES
+        token = verbose_var.set(verbose)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            verbose_var.reset(token)
+
+
+def configure_logging() -> None:
+    """Send leash.* logs to stderr, with debug records only for verbose requests"""
+    logger = logging.getLogger("leash")
+    if logger.handlers:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    # get_logger() loggers already skip non-verbose debug calls, this catches plain leash.* loggers
+    handler.addFilter(VerboseFilter())
+
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    logger.propagate = False
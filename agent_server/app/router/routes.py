@@ -1,30 +1,72 @@
-import asyncio
 import time
-import sys
-import os
-from typing import Optional
+from typing import Any, Callable, Dict, Type, TypeVar
 
-# Add parent directories to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-
-from fastapi import APIRouter, Depends, HTTPException
-from models.query_models import QueryRequest, QueryResponse, ModelsListResponse, CalendarFillRequest, CalendarFillResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from models.query_models import QueryRequest, QueryResponse, ModelsListResponse, CalendarFillRequest, CalendarFillResponse, WarmupRequest, WarmupResponse
 from app.services.ollama_service import OllamaService
+from app.request_logging import get_logger
 
 router = APIRouter()
 
+# Debug records are only built for requests made with ?verbose=true
+logger = get_logger("leash.routes")
+
 # Initialize Ollama service
 ollama_service = OllamaService()
 
-@router.get("/test-connection")
-async def test_connection(
-                        verbose: Optional[bool] = False
-                        ):
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def json_body(model: Type[ModelT]) -> Callable:
     """
-    Route to /test-connection GET endpoint
+    Dependency validating the raw request body straight into a model
+    
+    pydantic-core parses and validates the JSON bytes in one pass, rather than
+    FastAPI decoding them to a dict first. Errors are reported as the usual 422.
+    """
+    async def parse(http_request: Request) -> ModelT:
+        body = await http_request.body()
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+                body=body
+            )
+    return parse
 
-    Args:
-        # verbose (Optional[bool]): If True, prints the query execution time. Defaults to False.
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _inline_refs(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+        return {key: _inline_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    return node
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    openapi_extra documenting a json_body() model as the route's request body
+    
+    FastAPI only documents bodies it parses itself, so routes using json_body()
+    pass this to keep their requestBody in /openapi.json. Nested model
+    definitions are inlined since the schema sits outside components.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_refs(schema, defs)}}
+        }
+    }
+
+@router.get("/test-connection", response_model=None)
+async def test_connection():
+    """
+    Route to /test-connection GET endpoint
 
     Returns:
         dict:
@@ -40,17 +82,15 @@ async def test_connection(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/query", response_model=QueryResponse)
+@router.post("/query", response_model=QueryResponse, openapi_extra=json_body_openapi(QueryRequest))
 async def query_llm(
-    request: QueryRequest,
-    verbose: Optional[bool] = False
+    request: QueryRequest = Depends(json_body(QueryRequest))
 ):
     """
     Send a query to the Ollama LLM and get a text response
     
     Args:
         request: QueryRequest containing the query text and optional parameters
-        verbose: If True, logs additional debug information
 
     Returns:
         QueryResponse: The generated response from the LLM with metadata
@@ -59,11 +99,10 @@ async def query_llm(
         HTTPException: If there is an error with the query or Ollama service
     """
     try:
-        if verbose:
-            print(f"Processing query with model: {request.model}")
+        logger.debug("Processing query with model: %s", request.model)
         
         # Check if Ollama is running
-        if not await ollama_service.check_connection():
+        if not await ollama_service.ensure_connection():
             raise HTTPException(
                 status_code=503, 
                 detail="Ollama service is not running. Please start Ollama and try again."
@@ -78,8 +117,8 @@ async def query_llm(
             system_prompt=request.system_prompt
         )
         
-        if verbose and response.execution_time_ms:
-            print(f"Query processing took {response.execution_time_ms} ms")
+        if response.execution_time_ms:
+            logger.debug("Query processing took %s ms", response.execution_time_ms)
         
         if not response.success:
             raise HTTPException(status_code=500, detail=response.error)
@@ -92,14 +131,48 @@ async def query_llm(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
-@router.get("/models", response_model=ModelsListResponse)
-async def list_available_models(verbose: Optional[bool] = False):
+@router.post("/query/stream", openapi_extra=json_body_openapi(QueryRequest))
+async def query_llm_stream(
+    request: QueryRequest = Depends(json_body(QueryRequest))
+):
     """
-    List all available Ollama models
+    Send a query to the Ollama LLM and stream the response as server-sent events
     
     Args:
-        verbose: If True, logs additional debug information
+        request: QueryRequest containing the query text and optional parameters
 
+    Returns:
+        StreamingResponse: text/event-stream of {"content": ...} chunks followed by a "done" event
+
+    Raises:
+        HTTPException: If the Ollama service is not running
+    """
+    logger.debug("Streaming query with model: %s", request.model)
+    
+    # Check if Ollama is running before committing to a streaming response
+    if not await ollama_service.ensure_connection():
+        raise HTTPException(
+            status_code=503, 
+            detail="Ollama service is not running. Please start Ollama and try again."
+        )
+    
+    return StreamingResponse(
+        ollama_service.stream_response(
+            query=request.query,
+            model=request.model,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            system_prompt=request.system_prompt
+        ),
+        media_type="text/event-stream"
+    )
+
+
+@router.get("/models", response_model=ModelsListResponse)
+async def list_available_models():
+    """
+    List all available Ollama models
+    
     Returns:
         ModelsListResponse: List of available models
 
@@ -107,11 +180,10 @@ async def list_available_models(verbose: Optional[bool] = False):
         HTTPException: If there is an error connecting to Ollama
     """
     try:
-        if verbose:
-            print("Fetching available models from Ollama...")
+        logger.debug("Fetching available models from Ollama...")
         
         # Check if Ollama is running
-        if not await ollama_service.check_connection():
+        if not await ollama_service.ensure_connection():
             raise HTTPException(
                 status_code=503, 
                 detail="Ollama service is not running. Please start Ollama and try again."
@@ -119,8 +191,7 @@ async def list_available_models(verbose: Optional[bool] = False):
         
         response = await ollama_service.list_models()
         
-        if verbose:
-            print(f"Found {len(response.models)} available models")
+        logger.debug("Found %d available models", len(response.models))
         
         return response
         
@@ -131,13 +202,10 @@ async def list_available_models(verbose: Optional[bool] = False):
 
 
 @router.get("/health")
-async def health_check(verbose: Optional[bool] = False):
+async def health_check():
     """
     Comprehensive health check for the Ollama service
     
-    Args:
-        verbose: If True, logs additional debug information
-
     Returns:
         dict: Health check results including Ollama status and available models
 
@@ -145,13 +213,11 @@ async def health_check(verbose: Optional[bool] = False):
         HTTPException: If there is an error during health check
     """
     try:
-        if verbose:
-            print("Performing Ollama health check...")
+        logger.debug("Performing Ollama health check...")
         
         health_data = await ollama_service.health_check()
         
-        if verbose:
-            print(f"Health check completed. Ollama running: {health_data['ollama_server_running']}")
+        logger.debug("Health check completed. Ollama running: %s", health_data['ollama_server_running'])
         
         return health_data
         
@@ -159,10 +225,9 @@ async def health_check(verbose: Optional[bool] = False):
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 
-@router.post("/leash-daily-calendar-fill", response_model=CalendarFillResponse)
+@router.post("/leash-daily-calendar-fill", response_model=CalendarFillResponse, openapi_extra=json_body_openapi(CalendarFillRequest))
 async def leash_daily_calendar_fill(
-    request: CalendarFillRequest,
-    verbose: Optional[bool] = False
+    request: CalendarFillRequest = Depends(json_body(CalendarFillRequest))
 ):
     """
     Generate calendar suggestions for pet care activities based on current calendar,
@@ -174,7 +239,6 @@ async def leash_daily_calendar_fill(
     
     Args:
         request: CalendarFillRequest containing current calendar, pet details, and owner preferences
-        verbose: If True, logs additional debug information
 
     Returns:
         CalendarFillResponse: Generated calendar suggestions with metadata
@@ -183,15 +247,10 @@ async def leash_daily_calendar_fill(
         HTTPException: If there is an error with the request or Ollama service
     """
     try:
-        if verbose:
-            print(f"Processing calendar fill request with {len(request.pet_details)} pets and {len(request.current_calendar)} existing events")
-        
-        # Check if Ollama is running
-        if not await ollama_service.check_connection():
-            raise HTTPException(
-                status_code=503, 
-                detail="Ollama service is not running. Please start Ollama and try again."
-            )
+        logger.debug(
+            "Processing calendar fill request with %d pets and %d existing events",
+            len(request.pet_details), len(request.current_calendar)
+        )
         
         # Validate that we have at least one pet
         if not request.pet_details:
@@ -200,13 +259,20 @@ async def leash_daily_calendar_fill(
                 detail="At least one pet must be provided in pet_details"
             )
         
+        # Check if Ollama is running
+        if not await ollama_service.ensure_connection():
+            raise HTTPException(
+                status_code=503, 
+                detail="Ollama service is not running. Please start Ollama and try again."
+            )
+        
         # Generate calendar suggestions using Ollama
         response = await ollama_service.generate_calendar_suggestions(request)
         
-        if verbose and response.execution_time_ms:
-            print(f"Calendar generation took {response.execution_time_ms} ms")
+        if response.execution_time_ms:
+            logger.debug("Calendar generation took %s ms", response.execution_time_ms)
             if response.success:
-                print(f"Generated {len(response.suggestions)} calendar suggestions")
+                logger.debug("Generated %d calendar suggestions", len(response.suggestions))
         
         if not response.success:
             raise HTTPException(status_code=500, detail=response.error)
@@ -219,10 +285,89 @@ async def leash_daily_calendar_fill(
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
-@router.post("/sample-post")
+@router.post("/leash-daily-calendar-fill/stream", openapi_extra=json_body_openapi(CalendarFillRequest))
+async def leash_daily_calendar_fill_stream(
+    request: CalendarFillRequest = Depends(json_body(CalendarFillRequest))
+):
+    """
+    Stream calendar suggestions as server-sent events, one event per suggestion
+    
+    Args:
+        request: CalendarFillRequest containing current calendar, pet details, and owner preferences
+
+    Returns:
+        StreamingResponse: text/event-stream of "suggestion" events followed by a "done" event
+
+    Raises:
+        HTTPException: If the request is invalid or the Ollama service is not running
+    """
+    logger.debug(
+        "Streaming calendar fill request with %d pets and %d existing events",
+        len(request.pet_details), len(request.current_calendar)
+    )
+    
+    # Validate that we have at least one pet
+    if not request.pet_details:
+        raise HTTPException(
+            status_code=422,
+            detail="At least one pet must be provided in pet_details"
+        )
+    
+    # Check if Ollama is running before committing to a streaming response
+    if not await ollama_service.ensure_connection():
+        raise HTTPException(
+            status_code=503, 
+            detail="Ollama service is not running. Please start Ollama and try again."
+        )
+    
+    return StreamingResponse(
+        ollama_service.stream_calendar_suggestions(request),
+        media_type="text/event-stream"
+    )
+
+
+@router.post("/warmup", response_model=WarmupResponse)
+async def warmup_models(
+    request: WarmupRequest
+):
+    """
+    Load models into memory so the next requests don't pay the model load time.
+    Useful after a redeploy or once Ollama has unloaded idle models.
+    
+    Args:
+        request: WarmupRequest with the names of the models to load
+
+    Returns:
+        WarmupResponse: Whether each model was loaded
+
+    Raises:
+        HTTPException: If the Ollama service is not running
+    """
+    try:
+        logger.debug("Warming up models: %s", ", ".join(request.models))
+        
+        # Check if Ollama is running
+        if not await ollama_service.ensure_connection():
+            raise HTTPException(
+                status_code=503, 
+                detail="Ollama service is not running. Please start Ollama and try again."
+            )
+        
+        response = await ollama_service.warmup(request.models)
+        
+        logger.debug("Warmup took %s ms", response.execution_time_ms)
+        
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@router.post("/sample-post", response_model=None)
 async def create_sample_embeddings_endpoint(
-                                            request,
-                                            verbose: Optional[bool] = False
+                                            request
                                             ):
     """
     Route to testing the /sample-post POST endpoint
@@ -237,10 +382,10 @@ async def create_sample_embeddings_endpoint(
         HTTPException: If there is an error connecting to the database.
     """
     try:
-        t0 = time.time()
+        t0 = time.perf_counter()
         # Implement the logic here
-        t1 = time.time()
-        if verbose: print(f"create-sample-embeddings routine took {round((t1-t0)*1000, 2)} seconds")
+        t1 = time.perf_counter()
+        logger.debug("create-sample-embeddings routine took %s ms", round((t1-t0)*1000, 2))
         return {
             "success" : True,
             "internal_execution_time" : t1-t0,
@@ -1,17 +1,238 @@
 import asyncio
-import logging
+import hashlib
 import time
-from typing import Optional, List, Dict, Any
-import ollama
-from ollama import Client
+from typing import Optional, List, Dict, Any, AsyncIterator, Set, Tuple
 import httpx
-import sys
+import orjson
+from pydantic import TypeAdapter, ValidationError
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from models.query_models import QueryResponse, ModelInfo, ModelsListResponse, CalendarFillRequest, CalendarFillResponse, CalendarSuggestion
-import json
+from models.query_models import QueryResponse, ModelInfo, ModelsListResponse, CalendarFillRequest, CalendarFillResponse, CalendarSuggestion, WarmupResponse
+from app.services.response_cache import ResponseCache
+from app.request_logging import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger("leash.ollama")
+
+
+# Static part of the calendar system prompt. Kept byte-identical across requests
+# and emitted before any per-request data so the shared prefix is cache-friendly.
+STATIC_PROMPT_HEADER = """You are a professional pet care scheduler and dog training expert. Your job is to analyze the current calendar and pet/owner information to generate intelligent calendar suggestions for pet care activities.
+
+INSTRUCTIONS:
+1. Analyze the current calendar to identify gaps where pet care activities can be scheduled
+2. Consider each pet's specific needs, activity level, and any medications
+3. Respect the owner's preferences, work schedule, and availability
+4. Generate realistic, practical suggestions that fit the owner's lifestyle
+5. Include a variety of activities: walks, feeding times, play sessions, medication reminders, grooming, etc.
+6. Consider the time of day, weather appropriateness, and pet energy levels
+7. CRITICAL: Avoid conflicts with existing calendar events
+8. Prioritize essential activities (medication, feeding) over optional ones (extra play time)
+
+IMPORTANT TIMEZONE INFORMATION:
+- All times in the current calendar are shown in the owner's LOCAL timezone
+- When suggesting new activities, use times that make sense in the owner's daily routine
+- Consider that 7:00 AM means 7:00 AM in the owner's timezone, NOT UTC
+
+OUTPUT FORMAT:
+Respond with a JSON array of calendar suggestions. Each suggestion should be a JSON object with these exact fields:
+- "date": "YYYY-MM-DD"
+- "event_start_time_local": "YYYY-MM-DDTHH:MM:SS" (MUST include full date and time, e.g., "2025-07-29T06:30:00")
+- "event_end_time_local": "YYYY-MM-DDTHH:MM:SS" (MUST include full date and time, e.g., "2025-07-29T07:00:00")
+- "event_title": "Brief descriptive title"
+- "event_description": "Detailed description including specific instructions"
+- "priority": "high" | "medium" | "low"
+- "activity_type": "walk" | "feeding" | "medication" | "play" | "grooming" | "training" | "general"
+- "pet_names": ["PetName1", "PetName2"] (array of pet names this activity is for)
+
+IMPORTANT: 
+- Respond ONLY with valid JSON array, no additional text
+- Provide times in the user's LOCAL timezone (same format as the input calendar events)
+- ALWAYS include the full date in time fields (e.g., "2025-07-29T06:30:00", NOT just "06:30:00")
+- Include 3-5 realistic suggestions
+- CRITICAL: Compare your suggested times against the existing calendar events listed in the CONTEXT section below to avoid any time overlaps
+- Check that your start/end times don't conflict with any existing event start/end times. If they do, adjust your suggested times to avoid conflicts.
+- Consider realistic timing for the user's timezone (don't schedule walks at 3 AM local time)
+- Use 24-hour format for times (e.g., "14:00:00" for 2 PM)
+
+EXAMPLE OUTPUT:
+[
+  {
+    "date": "2025-07-29",
+    "event_start_time_local": "2025-07-29T07:00:00",
+    "event_end_time_local": "2025-07-29T07:30:00",
+    "event_title": "Morning Dog Walk",
+    "event_description": "Take the dogs for their morning exercise",
+    "priority": "high",
+    "activity_type": "walk",
+    "pet_names": ["June", "Gus"]
+  }
+]"""
+
+# Per-request part of the calendar system prompt, appended after STATIC_PROMPT_HEADER
+CALENDAR_CONTEXT_TEMPLATE = """Pet Details:
+{pets_section}
+
+
+Owner: {owner_name}
+- Yard access: {yard_access}
+- Preferred walk times: {preferred_walk_times}
+- Work schedule: {work_schedule}
+- Preferred activity duration: {preferred_activity_duration}
+- Availability notes: {availability_notes}
+
+Current Calendar Events:
+{calendar_section}
+
+{target_date_section}
+
+{timezone_section}"""
+
+# How long Ollama keeps the model (and its prompt cache) resident after a request
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Response cache settings
+CACHE_EMBED_MODEL = os.environ.get("LEASH_CACHE_EMBED_MODEL", "mxbai-embed-large")
+CACHE_SIMILARITY_THRESHOLD = float(os.environ.get("LEASH_CACHE_SIMILARITY", "0.97"))
+QUERY_CACHE_TTL = 3600.0  # 1 hour
+CALENDAR_CACHE_TTL = 600.0  # 10 minutes
+# Calendars/pet lists larger than this are turned into a prompt off the event loop
+PROMPT_OFFLOAD_THRESHOLD = 32
+# Tiered inference: simple calendar requests go to a small, fast model when it is installed.
+# The static prompt header alone is ~740 estimated tokens and a minimal single-pet prompt
+# ~840, so the limit leaves room for a short calendar and preferences.
+SMALL_CALENDAR_MODEL = os.environ.get("LEASH_SMALL_MODEL", "llama3.2:1b")
+SIMPLE_PROMPT_TOKEN_LIMIT = 1200
+# Models loaded into memory at startup so the first request doesn't pay the load time
+WARMUP_MODELS = [
+    m.strip()
+    for m in os.environ.get("OLLAMA_WARMUP_MODELS", f"llama3.2,{SMALL_CALENDAR_MODEL}").split(",")
+    if m.strip()
+]
+# Should match the Ollama server setting, extra generations queue here instead of inside Ollama
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+# After a successful call, skip connection probes for this long
+CONNECTION_OK_TTL = 10.0
+# After a failed probe or call, fail fast without probing for this long
+CONNECTION_RETRY_AFTER = 2.0
+MODELS_CACHE_TTL = 60.0  # Installed models rarely change, avoid listing them per request
+
+
+# Request bodies are encoded with orjson and sent as raw content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_SUGGESTIONS_ADAPTER = TypeAdapter(List[CalendarSuggestion])
+
+# Items missing any of these can't validate, so they are skipped without raising
+_REQUIRED_SUGGESTION_FIELDS = frozenset(
+    name for name, field in CalendarSuggestion.model_fields.items() if field.is_required()
+)
+
+
+def _extract_json_array(text: str) -> Optional[str]:
+    """
+    Return the first complete top-level JSON array in text, ignoring surrounding prose
+
+    Brackets inside JSON strings are skipped, so the array is closed at its
+    matching bracket rather than at the last ']' in the text.
+    """
+    start = text.find('[')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '[{':
+            depth += 1
+        elif ch in ']}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _temperature_key(temperature: Optional[float]) -> str:
+    # None leaves the temperature to Ollama, so it keys separately from any value
+    return "default" if temperature is None else str(round(temperature, 1))
+
+
+def _sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a payload as a server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+
+class _JsonArrayObjectScanner:
+    """Incrementally extracts complete objects from a JSON array streamed in chunks"""
+    
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start: Optional[int] = None
+        self.closed = False
+    
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Feed the next chunk of model output
+        
+        Args:
+            chunk: Newly generated text
+            
+        Returns:
+            List[str]: Raw JSON of each array element object completed by this chunk
+        """
+        text = self._text + chunk
+        objects = []
+        
+        for i in range(self._pos, len(text)):
+            if self.closed:
+                break
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                # Skip any prose the model emits before the array
+                if ch == '[':
+                    self._depth = 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '[{':
+                if ch == '{' and self._depth == 1:
+                    self._object_start = i
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.closed = True
+                elif self._depth == 1 and self._object_start is not None:
+                    objects.append(text[self._object_start:i + 1])
+                    self._object_start = None
+        
+        # Only keep the unfinished object around for the next chunk
+        keep_from = self._object_start if self._object_start is not None else len(text)
+        self._text = text[keep_from:]
+        if self._object_start is not None:
+            self._object_start = 0
+        self._pos = len(self._text)
+        return objects
 
 
 class OllamaService:
@@ -25,7 +246,27 @@ class OllamaService:
             base_url: The base URL for the Ollama server
         """
         self.base_url = base_url
-        self.client = Client(host=base_url)
+        # Shared, connection-pooled HTTP client so requests reuse keep-alive connections
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(300.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0)
+        )
+        self.cache = ResponseCache(
+            embed_fn=self._embed_text,
+            similarity_threshold=CACHE_SIMILARITY_THRESHOLD
+        )
+        # (fetched_at, response) of the last successful model listing
+        self._models_cache: Optional[Tuple[float, ModelsListResponse]] = None
+        self._models_lock = asyncio.Lock()
+        self._known_models: Set[str] = set()
+        # Generations currently running, keyed by a digest of their inputs
+        self._inflight: Dict[str, "asyncio.Task[QueryResponse]"] = {}
+        # Bounds concurrent chat calls to the slots Ollama actually has
+        self._generation_slots = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+        # perf_counter() of the last call that reached Ollama / of the last one that couldn't
+        self._last_ok = 0.0
+        self._last_failure = 0.0
         
     async def check_connection(self) -> bool:
         """
@@ -35,34 +276,189 @@ class OllamaService:
             bool: True if connection is successful, False otherwise
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/version", timeout=5.0)
-                return response.status_code == 200
+            response = await self._http.get("/api/version", timeout=5.0)
         except Exception as e:
             logger.error(f"Failed to connect to Ollama server: {e}")
+            self._mark_unreachable()
             return False
+        
+        if response.status_code != 200:
+            self._mark_unreachable()
+            return False
+        self._last_ok = time.perf_counter()
+        return True
+    
+    async def ensure_connection(self) -> bool:
+        """
+        Check that Ollama is reachable, skipping the probe when a recent call succeeded
+        
+        Returns False without probing when a call failed within the last
+        CONNECTION_RETRY_AFTER seconds, so requests fail fast while Ollama is down.
+        
+        Returns:
+            bool: True if Ollama is reachable, False otherwise
+        """
+        now = time.perf_counter()
+        if now - self._last_ok < CONNECTION_OK_TTL:
+            return True
+        if now - self._last_failure < CONNECTION_RETRY_AFTER:
+            return False
+        return await self.check_connection()
+    
+    def _mark_unreachable(self) -> None:
+        self._last_ok = 0.0
+        self._last_failure = time.perf_counter()
+    
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP client and its pooled connections
+        """
+        await self._http.aclose()
+    
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send a request to the Ollama API and decode the JSON response
+        
+        Args:
+            method: HTTP method
+            path: API path, e.g. "/api/chat"
+            **kwargs: Extra arguments forwarded to httpx
+            
+        Returns:
+            Dict: The decoded JSON body
+            
+        Raises:
+            RuntimeError: If Ollama responds with an error status
+        """
+        try:
+            response = await self._http.request(method, path, **kwargs)
+        except httpx.TransportError:
+            self._mark_unreachable()
+            raise
+        self._last_ok = time.perf_counter()
+        if response.is_error:
+            try:
+                detail = orjson.loads(response.content).get('error', response.text)
+            except ValueError:
+                detail = response.text
+            raise RuntimeError(f"Ollama returned {response.status_code}: {detail}")
+        return orjson.loads(response.content)
+    
+    def _chat_payload(
+        self,
+        query: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str],
+        stream: bool
+    ) -> Dict[str, Any]:
+        """
+        Build the request body for the Ollama chat API
+        
+        Returns:
+            Dict: JSON body for /api/chat
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": query})
+        
+        return {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            }
+        }
+    
+    async def _stream_chat(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream chunks from the Ollama chat API as they are generated
+        
+        Args:
+            payload: JSON body for /api/chat with "stream" set to True
+            
+        Yields:
+            Dict: Each decoded chunk, the last one has "done" set to True
+            
+        Raises:
+            RuntimeError: If Ollama responds with an error
+        """
+        async with self._generation_slots:
+            try:
+                async with self._http.stream("POST", "/api/chat", content=orjson.dumps(payload), headers=_JSON_HEADERS) as response:
+                    self._last_ok = time.perf_counter()
+                    if response.is_error:
+                        body = await response.aread()
+                        raise RuntimeError(f"Ollama returned {response.status_code}: {body.decode(errors='replace')}")
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = orjson.loads(line)
+                        if chunk.get('error'):
+                            raise RuntimeError(chunk['error'])
+                        yield chunk
+            except httpx.TransportError:
+                self._mark_unreachable()
+                raise
+    
+    def _cached_models(self) -> Optional[ModelsListResponse]:
+        if self._models_cache and time.monotonic() - self._models_cache[0] < MODELS_CACHE_TTL:
+            return self._models_cache[1]
+        return None
     
     async def list_models(self) -> ModelsListResponse:
         """
         List all available models in Ollama
         
+        Successful listings are cached for MODELS_CACHE_TTL seconds, and concurrent
+        callers share a single refresh.
+        
+        Returns:
+            ModelsListResponse: List of available models
+        """
+        cached = self._cached_models()
+        if cached is not None:
+            return cached
+        
+        async with self._models_lock:
+            # Another caller may have refreshed the cache while we waited
+            cached = self._cached_models()
+            if cached is not None:
+                return cached
+            
+            response = await self._fetch_models()
+            if response.success:
+                self._models_cache = (time.monotonic(), response)
+                # An untagged name means ":latest", so both spellings are accepted
+                self._known_models = {m.name for m in response.models}
+                self._known_models.update(
+                    name[:-len(":latest")] for name in list(self._known_models) if name.endswith(":latest")
+                )
+            return response
+    
+    async def _fetch_models(self) -> ModelsListResponse:
+        """
+        Fetch the installed models from Ollama, bypassing the cache
+        
         Returns:
             ModelsListResponse: List of available models
         """
         try:
-            # Use asyncio to run the sync ollama client in a thread pool
-            models_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.client.list
-            )
+            models_data = await self._request("GET", "/api/tags", timeout=10.0)
             
             models = []
             for model in models_data.get('models', []):
-                model_info = ModelInfo(
-                    name=model.get('name', ''),
-                    size=model.get('size', ''),
-                    modified_at=model.get('modified_at', ''),
-                    digest=model.get('digest', '')
-                )
+                model_info = ModelInfo.model_validate({
+                    'name': model.get('name', ''),
+                    'size': model.get('size', ''),
+                    'modified_at': model.get('modified_at', ''),
+                    'digest': model.get('digest', '')
+                })
                 models.append(model_info)
             
             return ModelsListResponse(success=True, models=models)
@@ -86,46 +482,170 @@ class OllamaService:
             bool: True if successful, False otherwise
         """
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.client.pull, model_name
+            # Pulling can take minutes for large models, so no read timeout here
+            await self._request(
+                "POST", "/api/pull",
+                content=orjson.dumps({"name": model_name, "stream": False}),
+                headers=_JSON_HEADERS,
+                timeout=httpx.Timeout(None, connect=5.0)
             )
+            # Make the next listing pick up the new model
+            self._models_cache = None
             return True
         except Exception as e:
             logger.error(f"Failed to pull model {model_name}: {e}")
             return False
     
+    async def warmup(self, models: List[str]) -> WarmupResponse:
+        """
+        Load models into memory ahead of the first real request
+        
+        Sends an empty generation for each model, which makes Ollama load it
+        and keep it resident for OLLAMA_KEEP_ALIVE. Missing models are not pulled.
+        
+        Args:
+            models: Names of the models to load
+            
+        Returns:
+            WarmupResponse: Whether each model was loaded
+        """
+        start_perf = time.perf_counter()
+        
+        async def load(model: str) -> bool:
+            try:
+                await self._request(
+                    "POST", "/api/generate",
+                    content=orjson.dumps({"model": model, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE}),
+                    headers=_JSON_HEADERS
+                )
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to warm up model {model}: {e}")
+                return False
+        
+        loaded = await asyncio.gather(*(load(model) for model in models))
+        results = dict(zip(models, loaded))
+        
+        return WarmupResponse(
+            success=all(loaded),
+            results=results,
+            execution_time_ms=round((time.perf_counter() - start_perf) * 1000, 2)
+        )
+    
+    async def _embed_text(self, text: str) -> Optional[List[float]]:
+        """
+        Embed a text with the cache embedding model
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Optional[List[float]]: The embedding, or None if it could not be computed
+        """
+        try:
+            response = await self._request(
+                "POST", "/api/embeddings",
+                content=orjson.dumps({"model": CACHE_EMBED_MODEL, "prompt": text}),
+                headers=_JSON_HEADERS
+            )
+            return response.get('embedding')
+        except Exception as e:
+            logger.debug(f"Failed to embed text with {CACHE_EMBED_MODEL}: {e}")
+            return None
+
     async def generate_response(
         self, 
         query: str, 
         model: str = "llama3.2",
         temperature: float = 0.7,
         max_tokens: int = 1000,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        use_cache: bool = True
     ) -> QueryResponse:
         """
         Generate a response using the specified model
         
+        Identical requests that arrive while a generation is already running
+        wait for that generation instead of starting their own.
+        
         Args:
             query: The input query/prompt
             model: Model name to use for generation
             temperature: Temperature for response generation
             max_tokens: Maximum tokens to generate
             system_prompt: Optional system prompt
+            use_cache: If True, serve repeated or near-identical prompts from the response cache
             
         Returns:
             QueryResponse: The generated response with metadata
         """
-        start_time = time.time()
+        start_perf = time.perf_counter()
+        cache_scope = f"query:{model}:{_temperature_key(temperature)}:{max_tokens}"
+        cache_text = f"{system_prompt or ''}\n{query}"
         
         try:
-            # Check if model is available, if not try to pull it
-            models_response = await self.list_models()
-            available_models = [m.name for m in models_response.models] if models_response.success else []
+            if use_cache:
+                cached = await self.cache.get(cache_scope, cache_text)
+                if cached is not None:
+                    response = QueryResponse.model_validate_json(cached)
+                    response.execution_time_ms = round((time.perf_counter() - start_perf) * 1000, 2)
+                    response.metadata = {**(response.metadata or {}), "cache_hit": True}
+                    return response
             
-            # Check if the requested model is available (handle version tags)
-            model_available = any(model in available_model for available_model in available_models)
+            inflight_key = hashlib.blake2b(
+                f"{model}\x00{system_prompt or ''}\x00{query}\x00{temperature}\x00{max_tokens}\x00{use_cache}".encode("utf-8"),
+                digest_size=16
+            ).hexdigest()
             
-            if not model_available:
+            task = self._inflight.get(inflight_key)
+            if task is None:
+                task = asyncio.create_task(self._generate(
+                    query, model, temperature, max_tokens, system_prompt,
+                    cache_scope if use_cache else None, cache_text, start_perf
+                ))
+                self._inflight[inflight_key] = task
+                task.add_done_callback(lambda done: self._inflight.pop(inflight_key, None) if self._inflight.get(inflight_key) is done else None)
+            
+            # Shielded so one caller disconnecting doesn't cancel the generation for the others
+            return await asyncio.shield(task)
+            
+        except Exception as e:
+            execution_time = (time.perf_counter() - start_perf) * 1000
+            logger.error(f"Failed to generate response: {e}")
+            return QueryResponse(
+                success=False,
+                error=f"Failed to generate response: {str(e)}",
+                execution_time_ms=round(execution_time, 2)
+            )
+    
+    async def _generate(
+        self,
+        query: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str],
+        cache_scope: Optional[str],
+        cache_text: str,
+        start_perf: float
+    ) -> QueryResponse:
+        """
+        Run a single generation, pulling the model first if needed
+        
+        Args:
+            cache_scope: Response cache scope to store the result under, or None to skip caching
+            cache_text: Prompt text the result is cached for
+            start_perf: When the originating request started, for execution_time_ms
+            
+        Returns:
+            QueryResponse: The generated response with metadata
+        """
+        try:
+            # Check if model is available, if not try to pull it
+            await self.list_models()
+            
+            # Check if the requested model is available
+            if model not in self._known_models:
                 logger.info(f"Model {model} not found, attempting to pull...")
                 pull_success = await self.pull_model(model)
                 if not pull_success:
@@ -134,28 +654,19 @@ class OllamaService:
                         error=f"Failed to pull model {model}. Please ensure the model name is correct."
                     )
             
-            # Prepare the messages for the chat API
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": query})
-            
             # Generate response using ollama
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: self.client.chat(
-                    model=model,
-                    messages=messages,
-                    options={
-                        "temperature": temperature,
-                        "num_predict": max_tokens,
-                    }
+            async with self._generation_slots:
+                response = await self._request(
+                    "POST", "/api/chat",
+                    content=orjson.dumps(
+                        self._chat_payload(query, model, temperature, max_tokens, system_prompt, stream=False)
+                    ),
+                    headers=_JSON_HEADERS
                 )
-            )
             
-            execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            execution_time = (time.perf_counter() - start_perf) * 1000  # Convert to milliseconds
             
-            return QueryResponse(
+            query_response = QueryResponse(
                 success=True,
                 response=response['message']['content'],
                 model_used=model,
@@ -168,8 +679,13 @@ class OllamaService:
                 }
             )
             
+            if cache_scope is not None:
+                await self.cache.set(cache_scope, cache_text, query_response.model_dump_json(), ttl=QUERY_CACHE_TTL)
+            
+            return query_response
+            
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter() - start_perf) * 1000
             logger.error(f"Failed to generate response: {e}")
             return QueryResponse(
                 success=False,
@@ -177,6 +693,57 @@ class OllamaService:
                 execution_time_ms=round(execution_time, 2)
             )
     
+    async def stream_response(
+        self,
+        query: str,
+        model: str = "llama3.2",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as server-sent events while the model generates it
+        
+        Unlike generate_response, this does not pull missing models; Ollama's
+        "model not found" error is forwarded as an error event instead.
+        
+        Args:
+            query: The input query/prompt
+            model: Model name to use for generation
+            temperature: Temperature for response generation
+            max_tokens: Maximum tokens to generate
+            system_prompt: Optional system prompt
+            
+        Yields:
+            str: SSE messages with {"content": ...} chunks, then a "done" or "error" event
+        """
+        start_perf = time.perf_counter()
+        payload = self._chat_payload(query, model, temperature, max_tokens, system_prompt, stream=True)
+        
+        try:
+            final_chunk: Dict[str, Any] = {}
+            async for chunk in self._stream_chat(payload):
+                content = chunk.get('message', {}).get('content')
+                if content:
+                    yield _sse({"content": content})
+                if chunk.get('done'):
+                    final_chunk = chunk
+            
+            yield _sse({
+                "model_used": model,
+                "execution_time_ms": round((time.perf_counter() - start_perf) * 1000, 2),
+                "metadata": {
+                    "total_duration": final_chunk.get('total_duration'),
+                    "load_duration": final_chunk.get('load_duration'),
+                    "prompt_eval_count": final_chunk.get('prompt_eval_count'),
+                    "eval_count": final_chunk.get('eval_count')
+                }
+            }, event="done")
+            
+        except Exception as e:
+            logger.error(f"Failed to stream response: {e}")
+            yield _sse({"error": f"Failed to stream response: {str(e)}"}, event="error")
+    
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform a comprehensive health check of the Ollama service
@@ -191,12 +758,13 @@ class OllamaService:
             "timestamp": time.time()
         }
         
-        # Check if server is running
-        health_data["ollama_server_running"] = await self.check_connection()
+        # Probe the server and list models concurrently, the listing is only used if the probe succeeds
+        health_data["ollama_server_running"], models_response = await asyncio.gather(
+            self.check_connection(), self.list_models()
+        )
         
         if health_data["ollama_server_running"]:
             # Get available models
-            models_response = await self.list_models()
             if models_response.success:
                 health_data["models_available"] = len(models_response.models)
                 health_data["available_models"] = [m.name for m in models_response.models]
@@ -227,130 +795,113 @@ class OllamaService:
         # Format pet details
         pets_info = []
         for pet in request.pet_details:
-            pet_info = f"- {pet.name} ({pet.breed}, {pet.age}, {pet.weight})"
-            pet_info += f"\n  • Daily walk time needed: {pet.walk_time_per_day}"
-            pet_info += f"\n  • Activity level: {pet.activity_level}"
+            parts = [
+                f"- {pet.name} ({pet.breed}, {pet.age}, {pet.weight})",
+                f"  • Daily walk time needed: {pet.walk_time_per_day}",
+                f"  • Activity level: {pet.activity_level}",
+            ]
             if pet.special_needs:
-                pet_info += f"\n  • Special needs: {pet.special_needs}"
+                parts.append(f"  • Special needs: {pet.special_needs}")
             if pet.current_medications:
-                pet_info += f"\n  • Medications: {len(pet.current_medications)} active medications"
-            pets_info.append(pet_info)
-        
-        pets_section = "\n".join(pets_info)
-        
-        # Format owner details
-        owner = request.owner_details
-        owner_info = f"""
-Owner: {owner.owner_name}
-- Yard access: {'Yes' if owner.yard_access else 'No'}
-- Preferred walk times: {', '.join(owner.preferred_walk_times) if owner.preferred_walk_times else 'No specific preference'}
-- Work schedule: {owner.work_schedule if owner.work_schedule else 'Not specified'}
-- Preferred activity duration: {owner.preferred_activity_duration}
-- Availability notes: {owner.availability_notes if owner.availability_notes else 'None'}"""
+                parts.append(f"  • Medications: {len(pet.current_medications)} active medications")
+            pets_info.append("\n".join(parts))
         
         # Format current calendar  
         current_events = []
         for event in request.current_calendar:
             # Show full datetime format to match the output format the AI should generate
             # This helps the AI properly compare times and avoid conflicts
-            event_info = f"- {event.event_title}"
-            event_info += f"\n  Start: {event.event_start_time_local}"
-            event_info += f"\n  End: {event.event_end_time_local}"
+            parts = [
+                f"- {event.event_title}",
+                f"  Start: {event.event_start_time_local}",
+                f"  End: {event.event_end_time_local}",
+            ]
             if event.event_description:
-                event_info += f"\n  Description: {event.event_description}"
-            current_events.append(event_info)
-        
-        calendar_section = "\n".join(current_events) if current_events else "No current events"
+                parts.append(f"  Description: {event.event_description}")
+            current_events.append("\n".join(parts))
         
-        target_date_section = f"Target date for suggestions: {request.target_date}" if request.target_date else "Generate suggestions for the next few days"
-        
-        timezone_section = f"User timezone: {request.user_timezone}" if request.user_timezone else "User timezone: Not specified (assume local time)"
+        owner = request.owner_details
+        context = CALENDAR_CONTEXT_TEMPLATE.format_map({
+            "pets_section": "\n".join(pets_info),
+            "owner_name": owner.owner_name,
+            "yard_access": 'Yes' if owner.yard_access else 'No',
+            "preferred_walk_times": ', '.join(owner.preferred_walk_times) if owner.preferred_walk_times else 'No specific preference',
+            "work_schedule": owner.work_schedule if owner.work_schedule else 'Not specified',
+            "preferred_activity_duration": owner.preferred_activity_duration,
+            "availability_notes": owner.availability_notes if owner.availability_notes else 'None',
+            "calendar_section": "\n".join(current_events) if current_events else "No current events",
+            "target_date_section": f"Target date for suggestions: {request.target_date}" if request.target_date else "Generate suggestions for the next few days",
+            "timezone_section": f"User timezone: {request.user_timezone}" if request.user_timezone else "User timezone: Not specified (assume local time)",
+        })
         
-        system_prompt = f"""You are a professional pet care scheduler and dog training expert. Your job is to analyze the current calendar and pet/owner information to generate intelligent calendar suggestions for pet care activities.
-
-CONTEXT INFORMATION:
-
-Pet Details:
-{pets_section}
-
-{owner_info}
-
-Current Calendar Events:
-{calendar_section}
-
-{target_date_section}
-
-{timezone_section}
-
-INSTRUCTIONS:
-1. Analyze the current calendar to identify gaps where pet care activities can be scheduled
-2. Consider each pet's specific needs, activity level, and any medications
-3. Respect the owner's preferences, work schedule, and availability
-4. Generate realistic, practical suggestions that fit the owner's lifestyle
-5. Include a variety of activities: walks, feeding times, play sessions, medication reminders, grooming, etc.
-6. Consider the time of day, weather appropriateness, and pet energy levels
-7. CRITICAL: Avoid conflicts with existing calendar events
-8. Prioritize essential activities (medication, feeding) over optional ones (extra play time)
-
-IMPORTANT TIMEZONE INFORMATION:
-- All times in the current calendar are shown in the owner's LOCAL timezone
-- When suggesting new activities, use times that make sense in the owner's daily routine
-- Consider that 7:00 AM means 7:00 AM in the owner's timezone, NOT UTC
-
-OUTPUT FORMAT:
-Respond with a JSON array of calendar suggestions. Each suggestion should be a JSON object with these exact fields:
-- "date": "YYYY-MM-DD"
-- "event_start_time_local": "YYYY-MM-DDTHH:MM:SS" (MUST include full date and time, e.g., "2025-07-29T06:30:00")
-- "event_end_time_local": "YYYY-MM-DDTHH:MM:SS" (MUST include full date and time, e.g., "2025-07-29T07:00:00")
-- "event_title": "Brief descriptive title"
-- "event_description": "Detailed description including specific instructions"
-- "priority": "high" | "medium" | "low"
-- "activity_type": "walk" | "feeding" | "medication" | "play" | "grooming" | "training" | "general"
-- "pet_names": ["PetName1", "PetName2"] (array of pet names this activity is for)
-
-IMPORTANT: 
-- Respond ONLY with valid JSON array, no additional text
-- Provide times in the user's LOCAL timezone (same format as the input calendar events)
-- ALWAYS include the full date in time fields (e.g., "2025-07-29T06:30:00", NOT just "06:30:00")
-- Include 3-5 realistic suggestions
-- CRITICAL: Compare your suggested times against the existing calendar events shown above to avoid any time overlaps
-- Check that your start/end times don't conflict with any existing event start/end times. If they do, adjust your suggested times to avoid conflicts.
-- Consider realistic timing for the user's timezone (don't schedule walks at 3 AM local time)
-- Use 24-hour format for times (e.g., "14:00:00" for 2 PM)
-
-EXAMPLE OUTPUT:
-[
-  {{
-    "date": "2025-07-29",
-    "event_start_time_local": "2025-07-29T07:00:00",
-    "event_end_time_local": "2025-07-29T07:30:00",
-    "event_title": "Morning Dog Walk",
-    "event_description": "Take the dogs for their morning exercise",
-    "priority": "high",
-    "activity_type": "walk",
-    "pet_names": ["June", "Gus"]
-  }}
-]"""
+        # Static instructions go first so every request shares the same prompt
+        # prefix and Ollama can reuse its cached KV state for it
+        system_prompt = STATIC_PROMPT_HEADER + "\n\nCONTEXT:\n" + context
 
         # Save the system prompt to a file for debugging
         try:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             prompt_file_path = os.path.join(current_dir, "latest_system_prompt.txt")
+            divider = "=" * 80
             with open(prompt_file_path, 'w', encoding='utf-8') as f:
-                f.write("="*80 + "\n")
-                f.write("LATEST SYSTEM PROMPT GENERATED\n")
-                f.write(f"Generated at: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("="*80 + "\n\n")
-                f.write(system_prompt)
-                f.write("\n\n" + "="*80 + "\n")
-                f.write("END OF PROMPT\n")
-                f.write("="*80 + "\n")
+                f.write("\n".join([
+                    divider,
+                    "LATEST SYSTEM PROMPT GENERATED",
+                    f"Generated at: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+                    divider,
+                    "",
+                    system_prompt,
+                    "",
+                    divider,
+                    "END OF PROMPT",
+                    divider,
+                    "",
+                ]))
             logger.info(f"System prompt saved to: {prompt_file_path}")
         except Exception as e:
             logger.warning(f"Failed to save system prompt to file: {e}")
         
         return system_prompt
     
+    async def _build_calendar_prompt(self, request: CalendarFillRequest) -> str:
+        """
+        Build the calendar system prompt, in a worker thread for large requests
+        
+        Prompt construction (and its debug dump to disk) is synchronous, so for
+        big calendars it is moved off the event loop to avoid stalling other requests.
+        
+        Args:
+            request: CalendarFillRequest containing pet and owner details
+            
+        Returns:
+            str: Formatted system prompt
+        """
+        if len(request.current_calendar) + len(request.pet_details) > PROMPT_OFFLOAD_THRESHOLD:
+            return await asyncio.to_thread(self._create_calendar_system_prompt, request)
+        return self._create_calendar_system_prompt(request)
+    
+    async def _select_calendar_model(self, request: CalendarFillRequest, system_prompt: str) -> Tuple[str, str]:
+        """
+        Pick the model for a calendar request based on its complexity
+        
+        Simple requests only go to SMALL_CALENDAR_MODEL if it is already installed,
+        so routing never makes a request wait for a model pull.
+        
+        Args:
+            request: CalendarFillRequest with all necessary details
+            system_prompt: The prompt built for the request
+            
+        Returns:
+            Tuple[str, str]: (model to use, "simple" | "complex")
+        """
+        prompt_tokens_est = len(system_prompt) // 4
+        complexity = "simple" if prompt_tokens_est < SIMPLE_PROMPT_TOKEN_LIMIT and len(request.pet_details) == 1 else "complex"
+        if complexity == "simple" and not request.force_model:
+            await self.list_models()  # Cached, refreshes _known_models
+            if SMALL_CALENDAR_MODEL in self._known_models:
+                return SMALL_CALENDAR_MODEL, complexity
+        return request.model, complexity
+    
     async def generate_calendar_suggestions(self, request: CalendarFillRequest) -> CalendarFillResponse:
         """
         Generate calendar suggestions based on pet and owner details
@@ -361,11 +912,22 @@ EXAMPLE OUTPUT:
         Returns:
             CalendarFillResponse: Generated calendar suggestions
         """
-        start_time = time.time()
+        start_perf = time.perf_counter()
         
         try:
             # Create the system prompt
-            system_prompt = self._create_calendar_system_prompt(request)
+            system_prompt = await self._build_calendar_prompt(request)
+            model, complexity = await self._select_calendar_model(request, system_prompt)
+            
+            # Calendar prompts are only served on an exact match: a near-identical
+            # context can still differ in the date or event times that matter most
+            cache_scope = f"calendar:{model}:{_temperature_key(request.temperature)}"
+            cached = await self.cache.get(cache_scope, system_prompt, semantic=False)
+            if cached is not None:
+                response = CalendarFillResponse.model_validate_json(cached)
+                response.execution_time_ms = round((time.perf_counter() - start_perf) * 1000, 2)
+                response.metadata = {**(response.metadata or {}), "cache_hit": True}
+                return response
             
             # Simple query asking for suggestions
             user_query = "Please generate calendar suggestions based on the provided context."
@@ -373,10 +935,11 @@ EXAMPLE OUTPUT:
             # Generate response using the standard generate_response method
             llm_response = await self.generate_response(
                 query=user_query,
-                model=request.model,
+                model=model,
                 temperature=request.temperature,
                 max_tokens=2000,  # More tokens for JSON response
-                system_prompt=system_prompt
+                system_prompt=system_prompt,
+                use_cache=False
             )
             
             if not llm_response.success:
@@ -391,40 +954,52 @@ EXAMPLE OUTPUT:
                 response_text = llm_response.response.strip()
                 
                 # Find the JSON array in the response
-                start_idx = response_text.find('[')
-                end_idx = response_text.rfind(']') + 1
-                
-                if start_idx == -1 or end_idx == 0:
+                json_text = _extract_json_array(response_text)
+                if json_text is None:
                     raise ValueError("No JSON array found in response")
                 
-                json_text = response_text[start_idx:end_idx]
-                suggestions_data = json.loads(json_text)
-                
-                # Convert to CalendarSuggestion objects
-                suggestions = []
-                for suggestion_dict in suggestions_data:
-                    try:
-                        suggestion = CalendarSuggestion(**suggestion_dict)
-                        suggestions.append(suggestion)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse suggestion: {e}")
-                        continue
+                try:
+                    # Parse and validate the whole array in one pass
+                    suggestions = _SUGGESTIONS_ADAPTER.validate_json(json_text)
+                    total_generated = len(suggestions)
+                except ValidationError:
+                    # Some items are malformed, keep the ones that validate
+                    suggestions_data = orjson.loads(json_text)
+                    total_generated = len(suggestions_data)
+                    suggestions = []
+                    for suggestion_dict in suggestions_data:
+                        if not isinstance(suggestion_dict, dict) or not _REQUIRED_SUGGESTION_FIELDS <= suggestion_dict.keys():
+                            logger.warning(f"Skipping malformed suggestion: {suggestion_dict!r:.200}")
+                            continue
+                        try:
+                            suggestions.append(CalendarSuggestion.model_validate(suggestion_dict))
+                        except ValidationError as e:
+                            logger.warning(f"Failed to parse suggestion: {e}")
                 
-                execution_time = (time.time() - start_time) * 1000
+                execution_time = (time.perf_counter() - start_perf) * 1000
                 
-                return CalendarFillResponse(
+                calendar_response = CalendarFillResponse(
                     success=True,
                     suggestions=suggestions,
                     execution_time_ms=round(execution_time, 2),
-                    model_used=request.model,
+                    model_used=model,
                     metadata={
-                        "total_suggestions_generated": len(suggestions_data),
+                        "total_suggestions_generated": total_generated,
                         "valid_suggestions": len(suggestions),
-                        "system_prompt_length": len(system_prompt)
+                        "system_prompt_length": len(system_prompt),
+                        "complexity": complexity
                     }
                 )
                 
-            except json.JSONDecodeError as e:
+                if suggestions:
+                    await self.cache.set(
+                        cache_scope, system_prompt, calendar_response.model_dump_json(),
+                        ttl=CALENDAR_CACHE_TTL, semantic=False
+                    )
+                
+                return calendar_response
+                
+            except orjson.JSONDecodeError as e:
                 return CalendarFillResponse(
                     success=False,
                     error=f"Failed to parse JSON response: {str(e)}. Raw response: {llm_response.response[:200]}..."
@@ -436,10 +1011,69 @@ EXAMPLE OUTPUT:
                 )
                 
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter() - start_perf) * 1000
             logger.error(f"Failed to generate calendar suggestions: {e}")
             return CalendarFillResponse(
                 success=False,
                 error=f"Failed to generate calendar suggestions: {str(e)}",
                 execution_time_ms=round(execution_time, 2)
-            ) 
\ No newline at end of file
+            )
+    
+    async def stream_calendar_suggestions(self, request: CalendarFillRequest) -> AsyncIterator[str]:
+        """
+        Stream calendar suggestions as server-sent events, one per suggestion
+        
+        Each suggestion is sent as soon as the model finishes writing its JSON
+        object, so the first one arrives long before the generation completes.
+        
+        Args:
+            request: CalendarFillRequest with all necessary details
+            
+        Yields:
+            str: SSE "suggestion" events, then a "done" or "error" event
+        """
+        start_perf = time.perf_counter()
+        
+        try:
+            system_prompt = await self._build_calendar_prompt(request)
+            model, complexity = await self._select_calendar_model(request, system_prompt)
+            payload = self._chat_payload(
+                "Please generate calendar suggestions based on the provided context.",
+                model,
+                request.temperature,
+                2000,  # More tokens for JSON response
+                system_prompt,
+                stream=True
+            )
+            
+            scanner = _JsonArrayObjectScanner()
+            generated = 0
+            valid = 0
+            async for chunk in self._stream_chat(payload):
+                for raw_suggestion in scanner.feed(chunk.get('message', {}).get('content', '')):
+                    generated += 1
+                    try:
+                        suggestion = CalendarSuggestion.model_validate_json(raw_suggestion)
+                    except ValidationError as e:
+                        logger.warning(f"Failed to parse suggestion: {e}")
+                        continue
+                    valid += 1
+                    yield _sse(suggestion.model_dump(), event="suggestion")
+            
+            if not scanner.closed and generated == 0:
+                raise ValueError("No JSON array found in response")
+            
+            yield _sse({
+                "model_used": model,
+                "execution_time_ms": round((time.perf_counter() - start_perf) * 1000, 2),
+                "metadata": {
+                    "total_suggestions_generated": generated,
+                    "valid_suggestions": valid,
+                    "system_prompt_length": len(system_prompt),
+                    "complexity": complexity
+                }
+            }, event="done")
+            
+        except Exception as e:
+            logger.error(f"Failed to stream calendar suggestions: {e}")
+            yield _sse({"error": f"Failed to stream calendar suggestions: {str(e)}"}, event="error")
@@ -0,0 +1,175 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.request_logging import get_logger
+
+logger = get_logger("leash.cache")
+
+EmbedFn = Callable[[str], Awaitable[Optional[List[float]]]]
+
+
+class ResponseCache:
+    """In-process LLM response cache with an exact-match fast path and a semantic fallback"""
+
+    def __init__(
+        self,
+        embed_fn: Optional[EmbedFn] = None,
+        similarity_threshold: float = 0.97,
+        max_entries: int = 1024,
+        embed_retry_after: float = 300.0
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            embed_fn: Async function returning an embedding for a text, or None on failure
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum number of cached responses kept in memory
+            embed_retry_after: Seconds to skip semantic lookups after an embedding failure
+        """
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.embed_retry_after = embed_retry_after
+
+        # digest -> (expires_at, scope, payload), in insertion order for eviction
+        self._entries: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+        # scope -> {digest: normalized embedding}
+        self._vectors: Dict[str, Dict[str, np.ndarray]] = {}
+        # scope -> (digests, stacked matrix, expiry times), rebuilt lazily after inserts/evictions
+        self._matrices: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]] = {}
+        # Embeddings computed on a miss, reused by the following set() for the same key
+        self._recent_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embed_disabled_until = 0.0
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    def _digest(self, scope: str, text: str) -> str:
+        return hashlib.sha256(f"{scope}\x00{self._normalize(text)}".encode("utf-8")).hexdigest()
+
+    async def _embed(self, digest: str, text: str) -> Optional[np.ndarray]:
+        if digest in self._recent_embeddings:
+            return self._recent_embeddings[digest]
+        if self.embed_fn is None or time.monotonic() < self._embed_disabled_until:
+            return None
+
+        embedding = await self.embed_fn(text)
+        if not embedding:
+            logger.warning("Embedding unavailable, disabling semantic cache lookups for %ss", self.embed_retry_after)
+            self._embed_disabled_until = time.monotonic() + self.embed_retry_after
+            return None
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        vector /= norm
+
+        self._recent_embeddings[digest] = vector
+        while len(self._recent_embeddings) > 64:
+            self._recent_embeddings.popitem(last=False)
+        return vector
+
+    def _remove(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        scope = entry[1]
+        if self._vectors.get(scope, {}).pop(digest, None) is not None:
+            self._matrices.pop(scope, None)
+
+    def _get_fresh(self, digest: str) -> Optional[str]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._remove(digest)
+            return None
+        return entry[2]
+
+    def _matrix(self, scope: str) -> Optional[Tuple[List[str], np.ndarray, np.ndarray]]:
+        if not self._vectors.get(scope):
+            return None
+        if scope not in self._matrices:
+            digests = list(self._vectors[scope])
+            self._matrices[scope] = (
+                digests,
+                np.vstack([self._vectors[scope][d] for d in digests]),
+                np.array([self._entries[d][0] for d in digests])
+            )
+        return self._matrices[scope]
+
+    def _search(self, scope: str, vector: np.ndarray) -> Optional[str]:
+        indexed = self._matrix(scope)
+        if indexed is None:
+            return None
+
+        # Purge expired rows first so an expired best match can't hide a fresh one
+        digests, _, expires_at = indexed
+        expired = np.flatnonzero(expires_at < time.monotonic())
+        if expired.size:
+            for i in expired:
+                self._remove(digests[i])
+            indexed = self._matrix(scope)
+            if indexed is None:
+                return None
+        digests, matrix, _ = indexed
+
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return self._entries[digests[best]][2]
+
+    async def get(self, scope: str, text: str, semantic: bool = True) -> Optional[str]:
+        """
+        Look up a cached payload
+
+        Args:
+            scope: Namespace the entry must belong to (e.g. endpoint, model and temperature)
+            text: The prompt text the payload was generated for
+            semantic: If True, fall back to an embedding similarity search on exact miss
+
+        Returns:
+            Optional[str]: The cached payload, or None on a miss
+        """
+        digest = self._digest(scope, text)
+        payload = self._get_fresh(digest)
+        if payload is not None or not semantic:
+            return payload
+
+        vector = await self._embed(digest, text)
+        if vector is None:
+            return None
+        return self._search(scope, vector)
+
+    async def set(self, scope: str, text: str, payload: str, ttl: float, semantic: bool = True) -> None:
+        """
+        Store a payload in the cache
+
+        Args:
+            scope: Namespace for the entry
+            text: The prompt text the payload was generated for
+            payload: Serialized response to cache
+            ttl: Time to live in seconds
+            semantic: If True, index the entry for similarity lookups
+        """
+        digest = self._digest(scope, text)
+        self._remove(digest)
+        self._entries[digest] = (time.monotonic() + ttl, scope, payload)
+
+        if semantic:
+            vector = await self._embed(digest, text)
+            self._recent_embeddings.pop(digest, None)
+            if vector is not None and digest in self._entries:
+                self._vectors.setdefault(scope, {})[digest] = vector
+                self._matrices.pop(scope, None)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
@@ -45,6 +45,18 @@ class ModelsListResponse(BaseModel):
     error: Optional[str] = Field(default=None, description="Error message if the request failed")
 
 
+class WarmupRequest(BaseModel):
+    """Request model for preloading models into memory"""
+    models: List[str] = Field(..., description="Names of the Ollama models to load", min_length=1)
+
+
+class WarmupResponse(BaseModel):
+    """Response model for model warmup results"""
+    success: bool = Field(..., description="Whether every requested model was loaded")
+    results: Dict[str, bool] = Field(default={}, description="Whether each model was loaded, by model name")
+    execution_time_ms: Optional[float] = Field(default=None, description="Time taken to load the models in milliseconds")
+
+
 # Calendar-related models for the leash daily calendar fill endpoint
 
 class CalendarEvent(BaseModel):
@@ -87,6 +99,7 @@ class CalendarFillRequest(BaseModel):
     user_timezone: Optional[str] = Field(default=None, description="User's timezone (e.g. 'America/Los_Angeles')")
     model: Optional[str] = Field(default="llama3.2", description="LLM model to use")
     temperature: Optional[float] = Field(default=0.7, description="Temperature for generation")
+    force_model: Optional[bool] = Field(default=False, description="Always use `model`, even for simple requests that would otherwise be routed to the small model")
 
 
 class CalendarSuggestion(BaseModel):
@@ -1,49 +1,103 @@
+import asyncio
+import contextlib
+import hashlib
 import os
+from typing import Optional, Tuple
 
 import uvicorn
 # from app.database import Base, engine
-from app.router.routes import router
+from app.request_logging import VerboseMiddleware, configure_logging
+from app.router.routes import router, ollama_service
+from app.services.ollama_service import WARMUP_MODELS
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import ORJSONResponse
 
 load_dotenv()
+configure_logging()
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
+app.add_middleware(VerboseMiddleware)
+
+# The frontend calls this server without credentials, so a plain wildcard origin
+# is enough and Starlette can skip echoing the origin back per request
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=os.environ.get("ALLOWED_ORIGINS", "*").split(","),
+    allow_credentials=False,
+    allow_methods=("GET", "POST", "OPTIONS"),
+    allow_headers=("Authorization", "Content-Type"),
 )
 
 app.include_router(router)
 
+# Keeps a reference to the startup warmup so it isn't garbage collected mid-run
+_warmup_task: Optional[asyncio.Task] = None
+
 @app.on_event("startup")
 async def startup():
     print("Starting up the server on port: ", os.environ.get("PORT", 5002))
+    # Run new tasks eagerly up to their first await, so probes and cache hits
+    # started with create_task don't wait for a loop iteration (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    load_static_files()
+    # Load models in the background so startup doesn't wait on (or fail with) Ollama.
+    # Registered on the app, not the router: include_router would run router hooks twice.
+    global _warmup_task
+    if WARMUP_MODELS:
+        _warmup_task = asyncio.create_task(ollama_service.warmup(WARMUP_MODELS))
     # async with engine.begin() as conn:
     #     await conn.run_sync(Base.metadata.create_all)
 
+@app.on_event("shutdown")
+async def shutdown():
+    # Stop a warmup still running from boot before its client goes away
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _warmup_task
+    # Closes the pooled Ollama client once; router hooks would run twice
+    await ollama_service.aclose()
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
 swagger_path = os.path.join(current_dir, './api/swagger.yaml')
 html_path = os.path.join(current_dir, './api/index.html')
 
+# (content, ETag) of the docs files, read once at startup since they only change per deploy
+_swagger_file: Optional[Tuple[bytes, str]] = None
+_html_file: Optional[Tuple[bytes, str]] = None
+
+def _read_static_file(path: str) -> Tuple[bytes, str]:
+    with open(path, 'rb') as f:
+        content = f.read()
+    return content, '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+
+def load_static_files():
+    global _swagger_file, _html_file
+    _swagger_file = _read_static_file(swagger_path)
+    _html_file = _read_static_file(html_path)
+
+def _static_response(request: Request, static_file: Optional[Tuple[bytes, str]], media_type: str) -> Response:
+    if static_file is None:
+        return ORJSONResponse({"error": "File not loaded"}, 500)
+    content, etag = static_file
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
 # localhost:PORT/swagger.yaml
-@app.get('/swagger.yaml', response_class=FileResponse)
-async def serve_swagger_yaml():
-    try:
-        return FileResponse(path= swagger_path, filename=swagger_path, media_type='application/yaml')
-    except Exception as e:
-        return JSONResponse ({"error": str(e)}, 500)
+@app.get('/swagger.yaml')
+async def serve_swagger_yaml(request: Request):
+    return _static_response(request, _swagger_file, 'application/yaml')
 
 # localhost:PORT/
-@app.get('/', response_class=FileResponse)
-async def serve_swagger_ui():
-    return FileResponse(html_path)
+@app.get('/')
+async def serve_swagger_ui(request: Request):
+    return _static_response(request, _html_file, 'text/html')
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 5002)))
\ No newline at end of file
@@ -15,9 +15,7 @@ from .dependencies import (
     get_current_user_optional,
     get_session_from_cookie,
     get_session_manager,
-    get_oauth_handler,
-    session_manager,
-    oauth_handler
+    get_oauth_handler
 )
 
 __all__ = [
@@ -35,7 +33,5 @@ __all__ = [
     "get_current_user_optional", 
     "get_session_from_cookie",
     "get_session_manager",
-    "get_oauth_handler",
-    "session_manager",
-    "oauth_handler"
+    "get_oauth_handler"
 ] 
\ No newline at end of file
@@ -1,22 +1,75 @@
+import asyncio
+import hashlib
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Dict, Optional
 from .models import UserSession
 from .session_manager import SessionManager
 from .oauth import GoogleOAuthHandler
 
-# Global instances
-session_manager = SessionManager()
-oauth_handler = GoogleOAuthHandler()
 security = HTTPBearer(auto_error=False)
 
+# Locks for verifications in progress, keyed by a truncated token hash, with the
+# number of requests holding or waiting on each so the last one out removes it
+_verify_locks: Dict[bytes, asyncio.Lock] = {}
+_verify_waiters: Dict[bytes, int] = {}
 
-async def get_session_from_cookie(request: Request) -> Optional[UserSession]:
+
+async def verify_access_token(oauth_handler: GoogleOAuthHandler, access_token: str) -> bool:
+    """
+    Verify an access token with Google, reusing recent verifications
+    
+    Concurrent verifications of the same token share one call to Google, which
+    runs in a worker thread so it doesn't block the event loop.
+    
+    Args:
+        oauth_handler: Handler used to verify the token with Google
+        access_token: Access token to verify
+        
+    Returns:
+        True if token is valid, False otherwise
+    """
+    cached = oauth_handler.cached_verification(access_token)
+    if cached is not None:
+        return cached
+    
+    key = hashlib.sha256(access_token.encode()).digest()[:16]
+    lock = _verify_locks.setdefault(key, asyncio.Lock())
+    _verify_waiters[key] = _verify_waiters.get(key, 0) + 1
+    try:
+        async with lock:
+            # Another request may have verified the token while this one waited
+            cached = oauth_handler.cached_verification(access_token)
+            if cached is not None:
+                return cached
+            return await asyncio.to_thread(oauth_handler.verify_credentials, access_token)
+    finally:
+        _verify_waiters[key] -= 1
+        if not _verify_waiters[key]:
+            del _verify_waiters[key]
+            del _verify_locks[key]
+
+
+async def get_session_manager(request: Request) -> SessionManager:
+    """Dependency to get the app's session manager"""
+    return request.app.state.session_manager
+
+
+async def get_oauth_handler(request: Request) -> GoogleOAuthHandler:
+    """Dependency to get the app's OAuth handler"""
+    return request.app.state.oauth_handler
+
+
+async def get_session_from_cookie(
+    request: Request,
+    session_manager: SessionManager = Depends(get_session_manager)
+) -> Optional[UserSession]:
     """
     Extract and verify user session from cookie
     
     Args:
         request: FastAPI request object
+        session_manager: Session manager used to verify the cookie
         
     Returns:
         UserSession if valid session exists, None otherwise
@@ -28,12 +81,18 @@ async def get_session_from_cookie(request: Request) -> Optional[UserSession]:
     return session_manager.verify_session(session_cookie)
 
 
-async def get_current_user(request: Request) -> UserSession:
+async def get_current_user(
+    request: Request,
+    session_manager: SessionManager = Depends(get_session_manager),
+    oauth_handler: GoogleOAuthHandler = Depends(get_oauth_handler)
+) -> UserSession:
     """
     Dependency to get current authenticated user (required)
     
     Args:
         request: FastAPI request object
+        session_manager: Session manager used to verify the cookie
+        oauth_handler: Handler used to verify and refresh tokens
         
     Returns:
         UserSession object
@@ -41,7 +100,7 @@ async def get_current_user(request: Request) -> UserSession:
     Raises:
         HTTPException: If user is not authenticated
     """
-    user_session = await get_session_from_cookie(request)
+    user_session = await get_session_from_cookie(request, session_manager)
     if not user_session:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,11 +109,12 @@ async def get_current_user(request: Request) -> UserSession:
         )
     
     # Verify token is still valid with Google
-    if not oauth_handler.verify_credentials(user_session.access_token):
+    if not await verify_access_token(oauth_handler, user_session.access_token):
         # Try to refresh token if we have a refresh token
         if user_session.refresh_token:
             try:
-                new_tokens = oauth_handler.refresh_access_token(user_session.refresh_token)
+                # The refresh is a blocking call to Google, so it runs in a worker thread
+                new_tokens = await asyncio.to_thread(oauth_handler.refresh_access_token, user_session.refresh_token)
                 # Note: In a real implementation, you'd want to update the session cookie here
                 # For now, we'll just return the original session
                 pass
@@ -74,27 +134,23 @@ async def get_current_user(request: Request) -> UserSession:
     return user_session
 
 
-async def get_current_user_optional(request: Request) -> Optional[UserSession]:
+async def get_current_user_optional(
+    request: Request,
+    session_manager: SessionManager = Depends(get_session_manager),
+    oauth_handler: GoogleOAuthHandler = Depends(get_oauth_handler)
+) -> Optional[UserSession]:
     """
     Dependency to get current authenticated user (optional)
     
     Args:
         request: FastAPI request object
+        session_manager: Session manager used to verify the cookie
+        oauth_handler: Handler used to verify and refresh tokens
         
     Returns:
         UserSession object if authenticated, None if not authenticated
     """
     try:
-        return await get_current_user(request)
+        return await get_current_user(request, session_manager, oauth_handler)
     except HTTPException:
         return None
-
-
-def get_session_manager() -> SessionManager:
-    """Dependency to get session manager instance"""
-    return session_manager
-
-
-def get_oauth_handler() -> GoogleOAuthHandler:
-    """Dependency to get OAuth handler instance"""
-    return oauth_handler 
\ No newline at end of file
@@ -1,10 +1,12 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class UserSession(BaseModel):
     """User session model for storing authentication state"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     user_email: str
     access_token: str
     refresh_token: Optional[str] = None
@@ -14,6 +16,8 @@ class UserSession(BaseModel):
     
 class AuthStatus(BaseModel):
     """Authentication status response model"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     authenticated: bool
     user_email: Optional[str] = None
     expires_at: Optional[datetime] = None
@@ -27,6 +31,8 @@ class LogoutResponse(BaseModel):
 
 class CalendarEvent(BaseModel):
     """Single calendar event model"""
+    model_config = ConfigDict(populate_by_name=True, frozen=True, extra="ignore")
+    
     id: Optional[str] = None
     title: str = Field(..., alias="event-title")
     start_time: datetime = Field(..., alias="event-start-time-UTC")
@@ -34,8 +40,16 @@ class CalendarEvent(BaseModel):
     description: Optional[str] = Field(None, alias="event-description")
     date: str  # YYYY-MM-DD format
     
-    class Config:
-        populate_by_name = True
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # Times without an offset are UTC, as the field aliases say
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+    
+    @model_validator(mode="after")
+    def check_end_after_start(self) -> "CalendarEvent":
+        if self._as_utc(self.end_time) <= self._as_utc(self.start_time):
+            raise ValueError(f"Event '{self.title}': end time must be after start time")
+        return self
 
 
 class CalendarEventRequest(BaseModel):
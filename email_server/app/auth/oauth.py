@@ -1,12 +1,85 @@
+import hashlib
+import logging
 import os
 import secrets
-from typing import Optional, Tuple
+import threading
+from typing import Any, Dict, Optional, Tuple
+import httplib2
+import requests
+from cachetools import TTLCache
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import Flow
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document, fix_method_name
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
 import json
 
+logger = logging.getLogger(__name__)
+
+# How long verify_credentials results are reused, keyed by a hash of the access token
+VERIFY_CACHE_TTL = 60
+VERIFY_FAILURE_TTL = 5  # Short, so a transient failure doesn't lock the user out for long
+VERIFY_CACHE_MAX_ENTRIES = 10_000
+# Connections kept open per Google host, shared by concurrent refreshes and verifications
+GOOGLE_POOL_SIZE = 32
+GOOGLE_REQUEST_TIMEOUT = 60
+
+PEOPLE_ME_URL = "https://people.googleapis.com/v1/people/me"
+
+# Parsed discovery documents by (api, version), shared by every service built below
+_discovery_docs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_discovery_lock = threading.Lock()
+
+# httplib2.Http isn't thread-safe, so each worker thread keeps its own, along
+# with the connections it has open to Google
+_thread_http = threading.local()
+
+
+def _shared_http() -> httplib2.Http:
+    http = getattr(_thread_http, "http", None)
+    if http is None:
+        http = _thread_http.http = build_http()
+    return http
+
+
+def _build_all_resources(resource, resource_desc: Dict[str, Any]) -> None:
+    for name, nested_desc in resource_desc.get("resources", {}).items():
+        _build_all_resources(getattr(resource, fix_method_name(name))(), nested_desc)
+
+
+def _build_service(api: str, version: str, credentials: Credentials):
+    """
+    Build a Google API service from a discovery document parsed once per process
+    
+    googleapiclient's build() reads and parses the bundled discovery document on
+    every call. The parsed document is cached here instead. googleapiclient fills
+    in method descriptions the first time each resource is built, so every
+    resource is built once up front and later builds only read the document.
+    Requests go through the calling thread's shared connection instead of a new
+    one per service.
+    
+    Args:
+        api: API name, e.g. "calendar"
+        version: API version, e.g. "v3"
+        credentials: Credentials the service authenticates with
+        
+    Returns:
+        The service Resource
+    """
+    http = AuthorizedHttp(credentials, http=_shared_http())
+    key = (api, version)
+    doc = _discovery_docs.get(key)
+    if doc is None:
+        with _discovery_lock:
+            doc = _discovery_docs.get(key)
+            if doc is None:
+                doc = json.loads(get_static_doc(api, version))
+                _build_all_resources(build_from_document(doc, http=http), doc)
+                _discovery_docs[key] = doc
+    return build_from_document(doc, http=http)
+
 
 class GoogleOAuthHandler:
     """Handles Google OAuth authentication flow"""
@@ -21,11 +94,11 @@ class GoogleOAuthHandler:
             'https://www.googleapis.com/auth/userinfo.profile',
             'https://www.googleapis.com/auth/calendar'
         ]
-        print(f"GoogleOAuthHandler initialized with:")
-        print(f"  client_id: {self.client_id}")
-        print(f"  client_secret: {'<hidden>' if self.client_secret else None}")
-        print(f"  redirect_uri: {self.redirect_uri}")
-        print(f"  scopes: {self.scopes}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "GoogleOAuthHandler initialized with client_id=%s client_secret=%s redirect_uri=%s scopes=%s",
+                self.client_id, '<hidden>' if self.client_secret else None, self.redirect_uri, self.scopes
+            )
         
         # Create client config for OAuth flow
         self.client_config = {
@@ -37,6 +110,35 @@ class GoogleOAuthHandler:
                 "redirect_uris": [self.redirect_uri]
             }
         }
+        self._scope_str = ' '.join(self.scopes)
+        
+        # Authorization URLs only depend on the immutable config above, so one
+        # Flow is reused. Token exchanges keep a fresh Flow since it holds the
+        # user's state and tokens.
+        self._authorization_flow: Optional[Flow] = None
+        self._authorization_flow_lock = threading.Lock()
+        
+        # Recent verify_credentials results; verification runs in worker threads, hence the lock
+        self._verified = TTLCache(maxsize=VERIFY_CACHE_MAX_ENTRIES, ttl=VERIFY_CACHE_TTL)
+        self._verify_failures = TTLCache(maxsize=VERIFY_CACHE_MAX_ENTRIES, ttl=VERIFY_FAILURE_TTL)
+        self._verify_cache_lock = threading.Lock()
+        
+        # Token refreshes and verifications reuse pooled connections rather than a
+        # new TLS handshake each time. requests.Session is safe to share between
+        # the worker threads these calls run in.
+        self._google_session = requests.Session()
+        self._google_session.mount("https://", requests.adapters.HTTPAdapter(
+            pool_connections=GOOGLE_POOL_SIZE, pool_maxsize=GOOGLE_POOL_SIZE
+        ))
+        self._token_request = Request(session=self._google_session)
+        
+    def _make_flow(self, state: Optional[str] = None) -> Flow:
+        return Flow.from_client_config(
+            self.client_config,
+            scopes=self.scopes,
+            redirect_uri=self.redirect_uri,
+            state=state
+        )
         
     def get_authorization_url(self) -> Tuple[str, str]:
         """
@@ -48,21 +150,19 @@ class GoogleOAuthHandler:
         if not self.client_id or not self.client_secret:
             raise ValueError("Google OAuth credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET environment variables.")
         
-        flow = Flow.from_client_config(
-            self.client_config,
-            scopes=self.scopes,
-            redirect_uri=self.redirect_uri
-        )
-        
         # Generate secure random state for CSRF protection
         state = secrets.token_urlsafe(32)
         
-        authorization_url, _ = flow.authorization_url(
-            access_type='offline',
-            include_granted_scopes='true',
-            state=state,
-            prompt='consent'  # Force consent screen to get refresh token
-        )
+        # authorization_url() updates the flow, so concurrent callers take turns
+        with self._authorization_flow_lock:
+            if self._authorization_flow is None:
+                self._authorization_flow = self._make_flow()
+            authorization_url, _ = self._authorization_flow.authorization_url(
+                access_type='offline',
+                include_granted_scopes='true',
+                state=state,
+                prompt='consent'  # Force consent screen to get refresh token
+            )
         
         return authorization_url, state
     
@@ -77,77 +177,66 @@ class GoogleOAuthHandler:
         Returns:
             Dictionary containing tokens and user info
         """
-        print(f"DEBUG: Starting token exchange with code: {code[:20]}...")
-        print(f"DEBUG: State: {state}")
-        print(f"DEBUG: Redirect URI: {self.redirect_uri}")
+        logger.debug("Starting token exchange, state: %s, redirect URI: %s", state, self.redirect_uri)
         
         if not self.client_id or not self.client_secret:
             raise ValueError("Google OAuth credentials not configured")
         
         try:
-            flow = Flow.from_client_config(
-                self.client_config,
-                scopes=self.scopes,
-                redirect_uri=self.redirect_uri,
-                state=state
-            )
-            print("DEBUG: Flow created successfully")
+            flow = self._make_flow(state)
+            logger.debug("Flow created successfully")
             
             # Exchange code for tokens
             flow.fetch_token(code=code)
-            print("DEBUG: Token fetched successfully")
+            logger.debug("Token fetched successfully")
             
             credentials = flow.credentials
-            print(f"DEBUG: Got credentials, token: {credentials.token[:20] if credentials.token else 'None'}...")
             
             # Try to get user info using the people API, fallback to token info
             user_email = None
             try:
                 # Method 1: Use People API (requires People API to be enabled)
-                people_service = build('people', 'v1', credentials=credentials)
-                print("DEBUG: People service built successfully")
+                people_service = _build_service('people', 'v1', credentials=credentials)
+                logger.debug("People service built successfully")
                 
                 profile = people_service.people().get(
                     resourceName='people/me',
                     personFields='names,emailAddresses'
                 ).execute()
-                print(f"DEBUG: Profile fetched successfully: {profile}")
+                logger.debug("Profile fetched successfully")
                 
                 # Extract user email
                 if 'emailAddresses' in profile:
                     user_email = profile['emailAddresses'][0]['value']
-                    print(f"DEBUG: Extracted email from People API: {user_email}")
+                    logger.debug("Extracted email from People API: %s", user_email)
                     
             except Exception as people_error:
-                print(f"DEBUG: People API failed: {people_error}")
-                print("DEBUG: Falling back to OAuth2 userinfo endpoint")
+                logger.debug("People API failed: %s, falling back to OAuth2 userinfo endpoint", people_error)
                 
                 # Method 2: Use OAuth2 userinfo endpoint (simpler, doesn't need People API)
                 try:
-                    oauth2_service = build('oauth2', 'v2', credentials=credentials)
+                    oauth2_service = _build_service('oauth2', 'v2', credentials=credentials)
                     userinfo = oauth2_service.userinfo().get().execute()
-                    print(f"DEBUG: Got userinfo: {userinfo}")
-                    
                     user_email = userinfo.get('email')
-                    print(f"DEBUG: Extracted email from userinfo: {user_email}")
+                    logger.debug("Extracted email from userinfo: %s", user_email)
                     
                 except Exception as oauth2_error:
-                    print(f"DEBUG: OAuth2 userinfo also failed: {oauth2_error}")
+                    logger.debug("OAuth2 userinfo also failed: %s", oauth2_error)
                     raise Exception("Could not retrieve user email from Google")
             
             if not user_email:
-                print("DEBUG: No email found in any method")
+                logger.debug("No email found in any method")
                 raise Exception("Could not retrieve user email from Google")
                 
         except Exception as e:
-            print(f"DEBUG: Exception in token exchange: {type(e).__name__}: {str(e)}")
+            logger.debug("Exception in token exchange: %s: %s", type(e).__name__, e)
             raise
         
         return {
             'access_token': credentials.token,
             'refresh_token': credentials.refresh_token,
             'expires_in': 3600,  # Default to 1 hour
-            'scope': ' '.join(self.scopes),
+            'scope': self._scope_str,
             'user_email': user_email,
             'credentials': credentials
         }
@@ -171,7 +260,7 @@ class GoogleOAuthHandler:
         )
         
         # Refresh the token
-        credentials.refresh(Request())
+        credentials.refresh(self._token_request)
         
         return {
             'access_token': credentials.token,
@@ -179,50 +268,56 @@ class GoogleOAuthHandler:
             'refresh_token': refresh_token  # Keep the same refresh token
         }
     
-    def get_calendar_service(self, access_token: str):
+    def cached_verification(self, access_token: str) -> Optional[bool]:
         """
-        Create Google Calendar service object
+        Look up a recent verify_credentials result without calling Google
         
         Args:
-            access_token: Valid access token
+            access_token: Access token to look up
             
         Returns:
-            Google Calendar service object
+            The cached result, or None if the token wasn't verified recently
         """
-        credentials = Credentials(
-            token=access_token,
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            token_uri="https://oauth2.googleapis.com/token"
-        )
-        
-        return build('calendar', 'v3', credentials=credentials)
+        key = hashlib.sha256(access_token.encode()).digest()
+        with self._verify_cache_lock:
+            if key in self._verified:
+                return True
+            if key in self._verify_failures:
+                return False
+        return None
     
     def verify_credentials(self, access_token: str) -> bool:
         """
         Verify if access token is still valid
         
+        Results are reused for VERIFY_CACHE_TTL seconds, or VERIFY_FAILURE_TTL
+        seconds for tokens that failed verification.
+        
         Args:
             access_token: Access token to verify
             
         Returns:
             True if token is valid, False otherwise
         """
+        cached = self.cached_verification(access_token)
+        if cached is not None:
+            return cached
+        
+        valid = self._verify_with_google(access_token)
+        key = hashlib.sha256(access_token.encode()).digest()
+        with self._verify_cache_lock:
+            (self._verified if valid else self._verify_failures)[key] = True
+        return valid
+    
+    def _verify_with_google(self, access_token: str) -> bool:
+        # Try to use the token to make a simple API call
         try:
-            credentials = Credentials(
-                token=access_token,
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                token_uri="https://oauth2.googleapis.com/token"
+            response = self._google_session.get(
+                PEOPLE_ME_URL,
+                params={'personFields': 'names'},
+                headers={'Authorization': f'Bearer {access_token}'},
+                timeout=GOOGLE_REQUEST_TIMEOUT
             )
-            
-            # Try to use the token to make a simple API call
-            people_service = build('people', 'v1', credentials=credentials)
-            people_service.people().get(
-                resourceName='people/me',
-                personFields='names'
-            ).execute()
-            
-            return True
-        except Exception:
-            return False 
\ No newline at end of file
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
@@ -1,10 +1,17 @@
+import hashlib
 import os
-import json
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from itsdangerous import TimestampSigner, BadSignature, SignatureExpired
+import orjson
+from cachetools import TTLCache
+from typing import Optional, Dict, Any, Tuple
+from .signing import TimestampSigner, BadSignature, SignatureExpired
 from .models import UserSession
 
+# How long a verified cookie's UserSession is reused before checking the signature again
+SESSION_CACHE_TTL = 60
+SESSION_CACHE_MAX_ENTRIES = 10_000
+
 
 class SessionManager:
     """Manages user sessions with secure signed cookies"""
@@ -13,6 +20,9 @@ class SessionManager:
         self.secret_key = os.getenv("SESSION_SECRET", "dev-secret-key-change-in-production")
         self.signer = TimestampSigner(self.secret_key)
         self.session_duration = timedelta(hours=24)  # 24 hour sessions
+        self._max_age = self.session_duration.total_seconds()
+        # Cookie hash -> (session, time it stops being valid); only used from the event loop
+        self._verified: TTLCache = TTLCache(maxsize=SESSION_CACHE_MAX_ENTRIES, ttl=SESSION_CACHE_TTL)
         
     def create_session(self, user_email: str, access_token: str, refresh_token: Optional[str] = None, expires_in: int = 3600) -> str:
         """
@@ -27,49 +37,85 @@ class SessionManager:
         Returns:
             Signed session cookie value
         """
-        session_data = UserSession(
-            user_email=user_email,
-            access_token=access_token,
-            refresh_token=refresh_token,
-            token_expires_at=datetime.utcnow() + timedelta(seconds=expires_in)
-        )
-        
-        # Convert to dict and then to JSON
-        session_json = session_data.model_dump_json()
+        # Times are stored as UNIX timestamps so verifying only compares floats
+        now = time.time()
+        session_json = orjson.dumps({
+            "user_email": user_email,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_expires_at": now + expires_in,
+            "created_at": now
+        })
         
         # Sign the session data
         signed_session = self.signer.sign(session_json)
         return signed_session.decode('utf-8')
     
+    @staticmethod
+    def _cache_key(signed_session: str) -> bytes:
+        return hashlib.blake2b(signed_session.encode('utf-8'), digest_size=16).digest()
+    
     def verify_session(self, signed_session: str) -> Optional[UserSession]:
         """
         Verify and decode a signed session cookie
         
+        Sessions are reused for SESSION_CACHE_TTL seconds after a cookie is first
+        verified, but never past the token or signature expiry.
+        
         Args:
             signed_session: Signed session cookie value
             
         Returns:
             UserSession object if valid, None if invalid or expired
         """
+        key = self._cache_key(signed_session)
+        cached: Optional[Tuple[UserSession, float]] = self._verified.get(key)
+        if cached is not None:
+            if cached[1] > time.time():
+                return cached[0]
+            self._verified.pop(key, None)
+        
+        user_session, valid_until = self._decode_session(signed_session)
+        if user_session is not None:
+            self._verified[key] = (user_session, valid_until)
+        return user_session
+    
+    def forget_session(self, signed_session: str) -> None:
+        """
+        Drop a cookie's cached session, e.g. on logout
+        
+        Args:
+            signed_session: Signed session cookie value
+        """
+        self._verified.pop(self._cache_key(signed_session), None)
+    
+    def _decode_session(self, signed_session: str) -> Tuple[Optional[UserSession], float]:
         try:
             # Verify signature and check if not older than session_duration
-            unsigned_session = self.signer.unsign(
-                signed_session, 
-                max_age=self.session_duration.total_seconds()
-            )
+            unsigned_session = self.signer.unsign(signed_session, max_age=self._max_age)
+            session_data = orjson.loads(unsigned_session)
             
-            # Parse JSON and create UserSession object
-            session_data = json.loads(unsigned_session)
-            user_session = UserSession(**session_data)
+            # Check if token is still valid before building the session
+            token_expires_at = session_data["token_expires_at"]
+            if token_expires_at <= time.time():
+                return None, 0.0
             
-            # Check if token is still valid
-            if user_session.token_expires_at > datetime.utcnow():
-                return user_session
-            else:
-                return None
+            # The payload was written by create_session and is covered by the
+            # signature, so it is trusted and doesn't need re-validating
+            created_at = session_data["created_at"]
+            user_session = UserSession.model_construct(
+                user_email=session_data["user_email"],
+                access_token=session_data["access_token"],
+                refresh_token=session_data.get("refresh_token"),
+                token_expires_at=datetime.utcfromtimestamp(token_expires_at),
+                created_at=datetime.utcfromtimestamp(created_at)
+            )
+            # The cookie is signed when the session is created, so its signature
+            # expires max_age after created_at
+            return user_session, min(token_expires_at, int(created_at) + self._max_age)
                 
-        except (BadSignature, SignatureExpired, json.JSONDecodeError, ValueError):
-            return None
+        except (BadSignature, SignatureExpired, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None, 0.0
     
     def destroy_session(self) -> bool:
         """
@@ -1,6 +1,7 @@
+import asyncio
 import os
 from fastapi import APIRouter, Request, HTTPException, Depends, status
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 from typing import Optional
 from ..auth import (
     get_current_user,
@@ -16,6 +17,27 @@ from ..auth import (
 
 router = APIRouter(tags=["authentication"])
 
+# Where the OAuth callback sends the user back to, read once at import
+FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5000")
+
+# The logout body never changes, so it is dumped once
+_LOGOUT_CONTENT = LogoutResponse(
+    success=True,
+    message="Logged out successfully"
+).model_dump()
+
+
+def _set_auth_cookie(response: Response, key: str, value: str, max_age: int) -> None:
+    """Set an HTTP-only cookie with the settings shared by the auth cookies"""
+    response.set_cookie(
+        key=key,
+        value=value,
+        max_age=max_age,
+        httponly=True,
+        secure=False,  # Set to True in production with HTTPS
+        samesite="lax"
+    )
+
 
 @router.get("/login")
 async def login(
@@ -32,14 +54,7 @@ async def login(
         
         # Store state in session for CSRF protection
         response = RedirectResponse(url=authorization_url)
-        response.set_cookie(
-            key="oauth_state",
-            value=state,
-            max_age=600,  # 10 minutes
-            httponly=True,
-            secure=False,  # Set to True in production with HTTPS
-            samesite="lax"
-        )
+        _set_auth_cookie(response, "oauth_state", state, max_age=600)  # 10 minutes
         
         return response
         
@@ -77,8 +92,8 @@ async def oauth_callback(
                 detail="Invalid state parameter. Possible CSRF attack."
             )
         
-        # Exchange code for tokens
-        token_data = oauth_handler.exchange_code_for_tokens(code, state)
+        # Exchange code for tokens in a worker thread, since it makes blocking calls to Google
+        token_data = await asyncio.to_thread(oauth_handler.exchange_code_for_tokens, code, state)
         
         if not token_data.get('user_email'):
             raise HTTPException(
@@ -95,17 +110,8 @@ async def oauth_callback(
         )
         
         # Redirect to frontend with session cookie
-        frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5000")
-        response = RedirectResponse(url=frontend_url)
-        
-        response.set_cookie(
-            key="session",
-            value=session_cookie,
-            max_age=86400,  # 24 hours
-            httponly=True,
-            secure=False,  # Set to True in production with HTTPS
-            samesite="lax"
-        )
+        response = RedirectResponse(url=FRONTEND_URL)
+        _set_auth_cookie(response, "session", session_cookie, max_age=86400)  # 24 hours
         
         # Clear the OAuth state cookie
         response.delete_cookie("oauth_state")
@@ -141,18 +147,20 @@ async def auth_status(
 
 
 @router.post("/logout", response_model=LogoutResponse)
-async def logout(request: Request):
+async def logout(
+    request: Request,
+    session_manager: SessionManager = Depends(get_session_manager)
+):
     """
     Logout user and destroy session
     
     Clears session cookie
     """
-    response = JSONResponse(
-        content=LogoutResponse(
-            success=True,
-            message="Logged out successfully"
-        ).model_dump()
-    )
+    session_cookie = request.cookies.get("session")
+    if session_cookie:
+        session_manager.forget_session(session_cookie)
+    
+    response = ORJSONResponse(content=_LOGOUT_CONTENT)
     
     # Clear session cookie
     response.delete_cookie("session")
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Query
-from googleapiclient.errors import HttpError
+from datetime import datetime
+from functools import lru_cache
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Depends, Request, status, Query
+from fastapi.responses import ORJSONResponse, Response
+import orjson
+import httpx
 from typing import List
+from pydantic import TypeAdapter
 from ..auth import (
     get_current_user,
-    get_oauth_handler,
     UserSession,
-    GoogleOAuthHandler,
     CalendarEventRequest,
+    CalendarEventResult,
     CalendarEventResponse
 )
 from ..services.calendar_service import CalendarService
@@ -14,11 +19,61 @@ from ..services.calendar_service import CalendarService
 router = APIRouter(tags=["calendar"])
 
 
-def get_calendar_service(
-    oauth_handler: GoogleOAuthHandler = Depends(get_oauth_handler)
-) -> CalendarService:
-    """Dependency to get calendar service instance"""
-    return CalendarService(oauth_handler)
+# Dumps all creation results in one pydantic-core call
+_RESULTS_ADAPTER = TypeAdapter(List[CalendarEventResult])
+
+# How long listed events are reused for repeat GETs of the same user and range,
+# e.g. tab refreshes and polling. Creating events drops the user's entries.
+EVENTS_CACHE_TTL = 30
+EVENTS_CACHE_MAX_ENTRIES = 1024
+
+# (user_email, start_date, end_date) -> encoded CalendarEventResponse body
+_events_cache = TTLCache(maxsize=EVENTS_CACHE_MAX_ENTRIES, ttl=EVENTS_CACHE_TTL)
+
+
+async def _events_response(
+    calendar_service: CalendarService,
+    user_session: UserSession,
+    start_date: str,
+    end_date: str
+) -> Response:
+    """
+    Build the events listing response, reusing a recently encoded body for the same user and range
+    
+    Events are already shaped like CalendarEventResponse.events, so they skip
+    response_model validation and are encoded with orjson once per cache entry.
+    """
+    key = (user_session.user_email, start_date, end_date)
+    body = _events_cache.get(key)
+    if body is None:
+        events = await calendar_service.get_events_bulk(
+            access_token=user_session.access_token,
+            start_date=start_date,
+            end_date=end_date
+        )
+        body = orjson.dumps({"success": True, "events": events, "results": None})
+        _events_cache[key] = body
+    return Response(content=body, media_type="application/json")
+
+
+def _invalidate_events(user_email: str) -> None:
+    for key in [key for key in _events_cache if key[0] == user_email]:
+        _events_cache.pop(key, None)
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_date(value: str) -> bool:
+    """Whether value is a YYYY-MM-DD date, cached since clients ask for the same few dates"""
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+async def get_calendar_service(request: Request) -> CalendarService:
+    """Dependency to get the app's shared calendar service instance"""
+    return request.app.state.calendar_service
 
 
 @router.get("/events", response_model=CalendarEventResponse)
@@ -42,33 +97,22 @@ async def get_calendar_events(
     """
     try:
         # Validate date format
-        from datetime import datetime
-        try:
-            datetime.strptime(date, "%Y-%m-%d")
-        except ValueError:
+        if not _is_valid_date(date):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid date format. Use YYYY-MM-DD."
             )
         
         # Get events from Google Calendar
-        events = calendar_service.get_events(
-            access_token=user_session.access_token,
-            date=date
-        )
+        return await _events_response(calendar_service, user_session, date, date)
         
-        return CalendarEventResponse(
-            success=True,
-            events=events
-        )
-        
-    except HttpError as error:
-        if error.resp.status == 401:
+    except httpx.HTTPStatusError as error:
+        if error.response.status_code == 401:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Google Calendar access denied. Please re-authenticate."
             )
-        elif error.resp.status == 403:
+        elif error.response.status_code == 403:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to access Google Calendar."
@@ -111,37 +155,30 @@ async def create_calendar_events(
                 detail="No events provided"
             )
         
-        # Validate events
-        for event in event_request.events:
-            if event.end_time <= event.start_time:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Event '{event.title}': end time must be after start time"
-                )
-        
         # Create events in Google Calendar
-        results = calendar_service.create_events(
+        results = await calendar_service.create_events(
             access_token=user_session.access_token,
             events=event_request.events
         )
+        _invalidate_events(user_session.user_email)
         
-        # Convert results to dict format for response
-        results_dict = [result.model_dump() for result in results]
-        
-        return CalendarEventResponse(
-            success=True,
-            results=results_dict
-        )
+        # Convert results to dict format for response. The body already matches
+        # CalendarEventResponse, so it goes straight to orjson.
+        return ORJSONResponse({
+            "success": True,
+            "events": None,
+            "results": _RESULTS_ADAPTER.dump_python(results)
+        })
         
     except HTTPException:
         raise
-    except HttpError as error:
-        if error.resp.status == 401:
+    except httpx.HTTPStatusError as error:
+        if error.response.status_code == 401:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Google Calendar access denied. Please re-authenticate."
             )
-        elif error.resp.status == 403:
+        elif error.response.status_code == 403:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to access Google Calendar."
@@ -179,35 +216,22 @@ async def get_calendar_events_bulk(
     """
     try:
         # Validate date format
-        from datetime import datetime
-        try:
-            datetime.strptime(start_date, "%Y-%m-%d")
-            datetime.strptime(end_date, "%Y-%m-%d")
-        except ValueError:
+        if not (_is_valid_date(start_date) and _is_valid_date(end_date)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid date format. Use YYYY-MM-DD."
             )
         
         # Get events from Google Calendar
-        events = calendar_service.get_events_bulk(
-            access_token=user_session.access_token,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        return CalendarEventResponse(
-            success=True,
-            events=events
-        )
+        return await _events_response(calendar_service, user_session, start_date, end_date)
         
-    except HttpError as error:
-        if error.resp.status == 401:
+    except httpx.HTTPStatusError as error:
+        if error.response.status_code == 401:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Google Calendar access denied. Please re-authenticate."
             )
-        elif error.resp.status == 403:
+        elif error.response.status_code == 403:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions to access Google Calendar."
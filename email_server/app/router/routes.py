@@ -1,14 +1,46 @@
 import os
 import time
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import HTTPException, APIRouter, Request
 from app.auth.dependencies import get_current_user, UserSession
 from fastapi import Depends
-import json
+import orjson
 
 router = APIRouter()
 
+PROFILES_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "profiles"))
+USERS_PROFILE_PATH = os.path.join(PROFILES_DIR, "users.json")
+PETS_PROFILE_PATH = os.path.join(PROFILES_DIR, "pets.json")
+
+ProfileData = Tuple[Any, Dict[str, Any]]
+
+
+def read_profiles(path: str) -> Optional[ProfileData]:
+    """
+    Read a profiles JSON file and index its userDetails entries by email
+    
+    Called once at startup, so requests never touch the filesystem.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        The parsed JSON data and its userDetails entries indexed by email,
+        or None if the file does not exist
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    email_index: Dict[str, Any] = {}
+    for user in data.get("userDetails", []):
+        if isinstance(user, dict) and "email" in user:
+            # First match wins, as with a linear scan
+            email_index.setdefault(user["email"], user)
+    return data, email_index
+
 # Include auth and calendar routes
 from .auth_routes import router as auth_router
 from .calendar_routes import router as calendar_router
@@ -16,7 +48,7 @@ from .calendar_routes import router as calendar_router
 router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 router.include_router(calendar_router, prefix="/calendar", tags=["calendar"])
 
-@router.get("/test-connection")
+@router.get("/test-connection", response_model=None)
 async def test_connection(
                         verbose: Optional[bool] = False
                         ):
@@ -38,7 +70,7 @@ async def test_connection(
         
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/sample-post")
+@router.post("/sample-post", response_model=None)
 async def create_sample_embeddings_endpoint(
                                             request,
                                             verbose: Optional[bool] = False
@@ -72,23 +104,20 @@ async def create_sample_embeddings_endpoint(
 
 @router.get("/profiles/users")
 async def get_user_profiles(
+    request: Request,
     user_session: UserSession = Depends(get_current_user)
 ):
     """
     Get user profile data. Returns current user's profile or all users for admin.
     """
     try:
-        profiles_path = os.path.join(os.path.dirname(__file__), "..", "..", "profiles", "users.json")
-        
-        with open(profiles_path, 'r') as f:
-            data = json.load(f)
+        profiles: Optional[ProfileData] = request.app.state.users_profiles
+        if profiles is None:
+            raise HTTPException(status_code=404, detail="User profiles not found")
+        data, email_index = profiles
         
         # Filter to current user's data based on email
-        user_details = data.get("userDetails", [])
-        current_user_profile = next(
-            (user for user in user_details if user.get("email") == user_session.user_email), 
-            None
-        )
+        current_user_profile = email_index.get(user_session.user_email)
         
         if current_user_profile:
             return {
@@ -99,27 +128,28 @@ async def get_user_profiles(
             # Return all users if current user not found (for development)
             return {
                 "success": True,
-                "users": user_details,
+                "users": data.get("userDetails", []),
                 "current_email": user_session.user_email
             }
             
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="User profiles not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading user profiles: {str(e)}")
 
 @router.get("/profiles/pets")
 async def get_pet_profiles(
+    request: Request,
     user_session: UserSession = Depends(get_current_user)
 ):
     """
     Get pet profile data for the authenticated user.
     """
     try:
-        profiles_path = os.path.join(os.path.dirname(__file__), "..", "..", "profiles", "pets.json")
-        
-        with open(profiles_path, 'r') as f:
-            data = json.load(f)
+        profiles: Optional[ProfileData] = request.app.state.pets_profiles
+        if profiles is None:
+            raise HTTPException(status_code=404, detail="Pet profiles not found")
+        data, _ = profiles
         
         pets = data.get("pets", [])
         
@@ -128,7 +158,7 @@ async def get_pet_profiles(
             "pets": pets
         }
             
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Pet profiles not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading pet profiles: {str(e)}")
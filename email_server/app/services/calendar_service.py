@@ -1,199 +1,137 @@
-from datetime import datetime, timezone
+import asyncio
 from typing import List, Dict, Any, Optional
-from googleapiclient.errors import HttpError
-from ..auth.oauth import GoogleOAuthHandler
+import httpx
+import orjson
 from ..auth.models import CalendarEvent, CalendarEventResult
 
+EVENTS_URL = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
+# Only the event fields _format_event reads, so Google sends less. backgroundColor and
+# foregroundColor aren't Event fields (selecting them is rejected), so they stay None.
+EVENT_LIST_FIELDS = "items(id,summary,description,colorId,start,end),nextPageToken"
+EVENT_LIST_PAGE_SIZE = 2500  # The largest page Google allows
+
+# Inserts in flight at once for one request, to stay clear of Google's per-user rate limits
+MAX_CONCURRENT_INSERTS = 10
+
+
+def _failed_result(event: CalendarEvent) -> CalendarEventResult:
+    return CalendarEventResult(
+        event_id="",
+        status="failed",
+        title=event.title
+    )
+
+
+def _format_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    # Timed events carry dateTime, all-day events only date
+    start = event['start']
+    end = event['end']
+    
+    return {
+        'id': event['id'],
+        'title': event.get('summary', 'No Title'),
+        'start_time': start['dateTime'] if 'dateTime' in start else start.get('date'),
+        'end_time': end['dateTime'] if 'dateTime' in end else end.get('date'),
+        'description': event.get('description', ''),
+        'color_id': event.get('colorId', '1'),  # Default to colorId 1 (blue)
+        'background_color': event.get('backgroundColor'),
+        'foreground_color': event.get('foregroundColor')
+    }
+
 
 class CalendarService:
-    """Service for Google Calendar operations"""
+    """Service for Google Calendar operations over the REST API"""
     
-    def __init__(self, oauth_handler: GoogleOAuthHandler):
-        self.oauth_handler = oauth_handler
+    def __init__(self, http_client: httpx.AsyncClient):
+        self.http_client = http_client
     
-    def get_events(self, access_token: str, date: str) -> List[Dict[str, Any]]:
-        """
-        Get calendar events for a specific date
-        
-        Args:
-            access_token: User's access token
-            date: Date in YYYY-MM-DD format
-            
-        Returns:
-            List of calendar events
-            
-        Raises:
-            HttpError: If Google API request fails
-        """
-        try:
-            service = self.oauth_handler.get_calendar_service(access_token)
-            
-            # Convert date to RFC3339 format for Google Calendar API
-            start_time = f"{date}T00:00:00Z"
-            end_time = f"{date}T23:59:59Z"
-            
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            
-            # Transform events to match our API format
-            formatted_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                formatted_event = {
-                    'id': event['id'],
-                    'title': event.get('summary', 'No Title'),
-                    'start_time': start,
-                    'end_time': end,
-                    'description': event.get('description', ''),
-                    'color_id': event.get('colorId', '1'),  # Default to colorId 1 (blue)
-                    'background_color': event.get('backgroundColor'),
-                    'foreground_color': event.get('foregroundColor')
-                }
-                formatted_events.append(formatted_event)
-            
-            return formatted_events
-            
-        except HttpError as error:
-            raise error
+    async def _call(self, access_token: str, method: str, url: str, **kwargs) -> Optional[Dict[str, Any]]:
+        response = await self.http_client.request(
+            method,
+            url,
+            headers={"Authorization": f"Bearer {access_token}"},
+            **kwargs
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content) if response.content else None
     
-    def get_events_bulk(self, access_token: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    async def get_events_bulk(self, access_token: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
-        Get calendar events for a date range
+        Get calendar events for a date range, inclusive of both dates
         
         Args:
             access_token: User's access token
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
-            
+        
         Returns:
             List of calendar events
-            
+        
         Raises:
-            HttpError: If Google API request fails
+            httpx.HTTPStatusError: If Google API request fails
         """
-        try:
-            service = self.oauth_handler.get_calendar_service(access_token)
-            
-            # Convert dates to RFC3339 format for Google Calendar API
-            start_time = f"{start_date}T00:00:00Z"
-            end_time = f"{end_date}T23:59:59Z"
-            
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            
-            # Transform events to match our API format
-            formatted_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                formatted_event = {
-                    'id': event['id'],
-                    'title': event.get('summary', 'No Title'),
-                    'start_time': start,
-                    'end_time': end,
-                    'description': event.get('description', ''),
-                    'color_id': event.get('colorId', '1'),  # Default to colorId 1 (blue)
-                    'background_color': event.get('backgroundColor'),
-                    'foreground_color': event.get('foregroundColor')
-                }
-                formatted_events.append(formatted_event)
-            
-            return formatted_events
-            
-        except HttpError as error:
-            raise error
+        # Convert dates to RFC3339 format for Google Calendar API
+        params = {
+            'timeMin': f"{start_date}T00:00:00Z",
+            'timeMax': f"{end_date}T23:59:59Z",
+            'singleEvents': 'true',
+            'orderBy': 'startTime',
+            'maxResults': EVENT_LIST_PAGE_SIZE,
+            'fields': EVENT_LIST_FIELDS
+        }
+        
+        # Transform events to match our API format, following pages for long ranges
+        formatted_events = []
+        while True:
+            events_result = await self._call(access_token, "GET", EVENTS_URL, params=params)
+            formatted_events.extend(_format_event(event) for event in events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return formatted_events
+            params['pageToken'] = page_token
     
-    def create_events(self, access_token: str, events: List[CalendarEvent]) -> List[CalendarEventResult]:
+    async def create_events(self, access_token: str, events: List[CalendarEvent]) -> List[CalendarEventResult]:
         """
-        Create multiple calendar events
+        Create multiple calendar events, sending the inserts concurrently
         
         Args:
             access_token: User's access token
             events: List of CalendarEvent objects to create
-            
+        
         Returns:
-            List of CalendarEventResult objects with creation status
-            
-        Raises:
-            HttpError: If Google API request fails
+            List of CalendarEventResult objects with creation status, in the order of events
         """
-        try:
-            service = self.oauth_handler.get_calendar_service(access_token)
-            results = []
-            
-            for event in events:
-                try:
-                    # Validate event times
-                    if event.end_time <= event.start_time:
-                        results.append(CalendarEventResult(
-                            event_id="",
-                            status="failed",
-                            title=event.title
-                        ))
-                        continue
-                    
-                    # Create Google Calendar event object
-                    calendar_event = {
-                        'summary': event.title,
-                        'description': event.description or '',
-                        'start': {
-                            'dateTime': event.start_time.isoformat(),
-                            'timeZone': 'UTC',
-                        },
-                        'end': {
-                            'dateTime': event.end_time.isoformat(),
-                            'timeZone': 'UTC',
-                        }
-                    }
-                    
-                    # Create the event
-                    created_event = service.events().insert(
-                        calendarId='primary',
-                        body=calendar_event
-                    ).execute()
-                    
-                    results.append(CalendarEventResult(
-                        event_id=created_event['id'],
-                        status="created",
-                        title=event.title
-                    ))
-                    
-                except HttpError as error:
-                    results.append(CalendarEventResult(
-                        event_id="",
-                        status="failed",
-                        title=event.title
-                    ))
-                except Exception as error:
-                    results.append(CalendarEventResult(
-                        event_id="",
-                        status="failed", 
-                        title=event.title
-                    ))
-            
-            return results
-            
-        except HttpError as error:
-            raise error
+        slots = asyncio.Semaphore(MAX_CONCURRENT_INSERTS)
+        
+        async def create(event: CalendarEvent) -> CalendarEventResult:
+            # Create Google Calendar event object
+            calendar_event = {
+                'summary': event.title,
+                'description': event.description or '',
+                'start': {
+                    'dateTime': event.start_time.isoformat(),
+                    'timeZone': 'UTC',
+                },
+                'end': {
+                    'dateTime': event.end_time.isoformat(),
+                    'timeZone': 'UTC',
+                }
+            }
+            
+            try:
+                async with slots:
+                    created_event = await self._call(access_token, "POST", EVENTS_URL, json=calendar_event)
+                return CalendarEventResult(
+                    event_id=created_event['id'],
+                    status="created",
+                    title=event.title
+                )
+            except Exception:
+                return _failed_result(event)
+        
+        return list(await asyncio.gather(*(create(event) for event in events)))
     
-    def update_event(self, access_token: str, event_id: str, event_data: Dict[str, Any]) -> bool:
+    async def update_event(self, access_token: str, event_id: str, event_data: Dict[str, Any]) -> bool:
         """
         Update an existing calendar event
         
@@ -201,15 +139,14 @@ class CalendarService:
             access_token: User's access token
             event_id: Google Calendar event ID
             event_data: Event data to update
-            
+        
         Returns:
             True if successful, False otherwise
         """
+        url = f"{EVENTS_URL}/{event_id}"
         try:
-            service = self.oauth_handler.get_calendar_service(access_token)
-            
             # Get the existing event
-            event = service.events().get(calendarId='primary', eventId=event_id).execute()
+            event = await self._call(access_token, "GET", url)
             
             # Update with new data
             if 'title' in event_data:
@@ -222,33 +159,27 @@ class CalendarService:
                 event['end']['dateTime'] = event_data['end_time']
             
             # Update the event
-            updated_event = service.events().update(
-                calendarId='primary',
-                eventId=event_id,
-                body=event
-            ).execute()
+            await self._call(access_token, "PUT", url, json=event)
             
             return True
-            
-        except HttpError:
+        
+        except httpx.HTTPStatusError:
             return False
     
-    def delete_event(self, access_token: str, event_id: str) -> bool:
+    async def delete_event(self, access_token: str, event_id: str) -> bool:
         """
         Delete a calendar event
         
         Args:
             access_token: User's access token
             event_id: Google Calendar event ID
-            
+        
         Returns:
             True if successful, False otherwise
         """
         try:
-            service = self.oauth_handler.get_calendar_service(access_token)
-            
-            service.events().delete(calendarId='primary', eventId=event_id).execute()
+            await self._call(access_token, "DELETE", f"{EVENTS_URL}/{event_id}")
             return True
-            
-        except HttpError:
-            return False 
\ No newline at end of file
+        
+        except httpx.HTTPStatusError:
+            return False
@@ -4,83 +4,108 @@ from dotenv import load_dotenv
 # Load environment variables FIRST, before any other imports
 load_dotenv()
 
+import httpx
 import uvicorn
 # from app.database import Base, engine
-from app.router.routes import router
-from fastapi import FastAPI
+from app.auth import GoogleOAuthHandler, SessionManager
+from app.router.routes import router, read_profiles, USERS_PROFILE_PATH, PETS_PROFILE_PATH
+from app.services.calendar_service import CalendarService
+from fastapi import FastAPI, Response
+from fastapi.openapi.utils import get_openapi
+import yaml
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from typing import Optional
 from fastapi.openapi.docs import get_swagger_ui_html
 
+PORT = int(os.environ.get("PORT", 5001))
+
 app = FastAPI(
     title="Email Server API",
     description="FastAPI server for email and calendar integration services with Google OAuth authentication",
     version="1.0.0",
     docs_url=None,  # Disable default docs to customize
-    redoc_url=None
+    redoc_url=None,
+    default_response_class=ORJSONResponse
 )
 
+# The frontend sends the session cookie, so origins must be listed explicitly
+# rather than "*". Defaults to FRONTEND_URL and the Vite dev server.
+ALLOWED_ORIGINS = (
+    os.environ.get("ALLOWED_ORIGINS")
+    or f'{os.environ.get("FRONTEND_URL", "http://localhost:5000")},http://localhost:5173'
+).split(",")
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST", "OPTIONS"),
+    allow_headers=("Authorization", "Content-Type"),
+    max_age=86400,  # Let browsers reuse preflight results for a day
 )
 
 app.include_router(router)
 
 
+# The docs page is static, so its HTML is generated once
+_DOCS_HTML = get_swagger_ui_html(
+    openapi_url="/openapi.json",
+    title="Email Server API Documentation"
+).body
+
+
 @app.get("/", include_in_schema=False)
 async def docs():
     """Serve custom Swagger UI documentation"""
-    return get_swagger_ui_html(
-        openapi_url="/openapi.json",
-        title="Email Server API Documentation"
-    )
+    return HTMLResponse(content=_DOCS_HTML)
 
 
-@app.get("/swagger.yaml", include_in_schema=False)
-async def get_swagger_yaml():
-    """Return OpenAPI specification in YAML format"""
-    from fastapi.openapi.utils import get_openapi
-    import yaml
-    
+# The routes don't change after startup, so the YAML spec is rendered once there
+_swagger_yaml: Optional[bytes] = None
+
+
+def render_swagger_yaml() -> bytes:
     openapi_schema = get_openapi(
         title="Email Server API",
         version="1.0.0", 
         description="FastAPI server for email and calendar integration services",
         routes=app.routes
     )
-    
-    return JSONResponse(
-        content=yaml.dump(openapi_schema, default_flow_style=False),
-        media_type="application/x-yaml"
-    )
+    # The C dumper is much faster, but only exists when PyYAML was built with libyaml
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(openapi_schema, Dumper=dumper, default_flow_style=False).encode("utf-8")
+
+
+@app.get("/swagger.yaml", include_in_schema=False)
+async def get_swagger_yaml():
+    """Return OpenAPI specification in YAML format"""
+    return Response(content=_swagger_yaml, media_type="application/x-yaml")
 
 
 @app.on_event("startup")
 async def startup():
-    print("Starting up the server on port: ", os.environ.get("PORT", 5001))
+    print("Starting up the server on port: ", PORT)
+    # Shared by every request through the get_session_manager / get_oauth_handler / get_calendar_service dependencies
+    app.state.session_manager = SessionManager()
+    app.state.oauth_handler = GoogleOAuthHandler()
+    # Profiles are read once here so the /profiles routes never block on disk; restart to pick up edits
+    app.state.users_profiles = read_profiles(USERS_PROFILE_PATH)
+    app.state.pets_profiles = read_profiles(PETS_PROFILE_PATH)
+    # One pooled client for Google REST calls, so requests reuse open connections
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=30.0)
+    )
+    app.state.calendar_service = CalendarService(app.state.http_client)
+    global _swagger_yaml
+    _swagger_yaml = render_swagger_yaml()
     # async with engine.begin() as conn:
     #     await conn.run_sync(Base.metadata.create_all)
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-swagger_path = os.path.join(current_dir, './api/swagger.yaml')
-html_path = os.path.join(current_dir, './api/index.html')
-
-# localhost:PORT/swagger.yaml
-@app.get('/swagger.yaml', response_class=FileResponse)
-async def serve_swagger_yaml():
-    try:
-        return FileResponse(path= swagger_path, filename=swagger_path, media_type='application/yaml')
-    except Exception as e:
-        return JSONResponse ({"error": str(e)}, 500)
-
-# localhost:PORT/
-@app.get('/', response_class=FileResponse)
-async def serve_swagger_ui():
-    return FileResponse(html_path)
+@app.on_event("shutdown")
+async def shutdown():
+    await app.state.http_client.aclose()
 
 if __name__ == "__main__":
     env_vars = [
@@ -94,4 +119,4 @@ if __name__ == "__main__":
     print("Loaded environment variables:")
     for var in env_vars:
         print(f"{var} = {os.environ.get(var)}")
-    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 5001)))
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=PORT)
\ No newline at end of file